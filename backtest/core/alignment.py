@@ -0,0 +1,110 @@
+import heapq
+import itertools
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from backtest.model.candle import Candle
+from backtest.model.constant import AlignmentPolicy, TimeFrame
+
+
+class CandleAligner:
+    def __init__(self, symbols: List[str], time_frame: TimeFrame, policy: AlignmentPolicy = AlignmentPolicy.FFILL,
+                 fill_limit: int = None, start: int = None):
+        if policy not in [AlignmentPolicy.FFILL, AlignmentPolicy.SKIP, AlignmentPolicy.FLAG]:
+            raise ValueError("Unknown alignment policy {}".format(policy))
+
+        self.__symbols: List[str] = symbols
+        self.__time_frame: TimeFrame = time_frame
+        self.__policy: AlignmentPolicy = policy
+        self.__fill_limit: int = fill_limit
+        self.__start: int = start
+
+        # states
+        self.__timestamp: int = None
+        self.__last_candles_dict: Dict[str, Candle] = {}
+        self.__fill_counts_dict: Dict[str, int] = {}
+        self.__gaps: List[Tuple[int, str]] = []
+        self.__filled_candles: int = 0
+        self.__dropped_candles: int = 0
+
+    @property
+    def policy(self) -> AlignmentPolicy:
+        return self.__policy
+
+    @property
+    def timestamp(self) -> int:
+        return self.__timestamp
+
+    @property
+    def gaps(self) -> List[Tuple[int, str]]:
+        return self.__gaps
+
+    @property
+    def filled_candles(self) -> int:
+        return self.__filled_candles
+
+    @property
+    def dropped_candles(self) -> int:
+        return self.__dropped_candles
+
+    def align(self, candles_dict: Dict[str, Iterable[Candle]]) -> Iterator[Dict[str, Candle]]:
+        # a k-way merge keeps one candle per symbol in memory, each stream only has to be sorted by itself
+        iterators = [zip(itertools.repeat(symbol), candles) for symbol, candles in candles_dict.items()]
+        timestamp, bar_dict = None, {}
+        for symbol, candle in heapq.merge(*iterators, key=lambda item: item[1].timestamp):
+            if candle.timestamp % self.__time_frame or symbol not in self.__symbols or \
+                    (timestamp is not None and candle.timestamp < timestamp) or \
+                    (self.__start is not None and candle.timestamp <= self.__start) or \
+                    (self.__timestamp is not None and candle.timestamp <= self.__timestamp):
+                self.__dropped_candles += 1
+                continue
+
+            if candle.timestamp != timestamp:
+                if bar_dict:
+                    yield from self.__release(timestamp, bar_dict)
+                timestamp, bar_dict = candle.timestamp, {}
+            if symbol in bar_dict:
+                self.__dropped_candles += 1
+                continue
+            bar_dict[symbol] = candle
+
+        if bar_dict:
+            yield from self.__release(timestamp, bar_dict)
+
+    def __fill(self, symbol: str, timestamp: int, aligned_dict: Dict[str, Candle]):
+        # a symbol is carried for at most fill_limit consecutive bars, later bars are left out and recorded as gaps
+        if symbol not in self.__last_candles_dict:
+            return
+        if self.__fill_limit is not None and self.__fill_limit <= self.__fill_counts_dict.get(symbol, 0):
+            self.__gaps.append((timestamp, symbol))
+            return
+        close = self.__last_candles_dict[symbol].close
+        aligned_dict[symbol] = Candle(timestamp, close, close, close, close, 0)
+        self.__fill_counts_dict[symbol] = self.__fill_counts_dict.get(symbol, 0) + 1
+        self.__filled_candles += 1
+
+    def __release(self, timestamp: int, bar_dict: Dict[str, Candle]) -> Iterator[Dict[str, Candle]]:
+        if self.__timestamp is not None:
+            missing_timestamps = range(self.__timestamp + self.__time_frame, timestamp, self.__time_frame)
+            if AlignmentPolicy.FFILL == self.__policy:
+                for missing_timestamp in missing_timestamps:
+                    filled_dict = {}
+                    for symbol in self.__symbols:
+                        self.__fill(symbol, missing_timestamp, filled_dict)
+                    if filled_dict:
+                        yield filled_dict
+            elif AlignmentPolicy.FLAG == self.__policy:
+                self.__gaps.extend(itertools.product(missing_timestamps, self.__symbols))
+
+        aligned_dict = {}
+        for symbol in self.__symbols:
+            if symbol in bar_dict:
+                aligned_dict[symbol] = bar_dict[symbol]
+                self.__fill_counts_dict[symbol] = 0
+            elif AlignmentPolicy.FFILL == self.__policy:
+                self.__fill(symbol, timestamp, aligned_dict)
+            elif AlignmentPolicy.FLAG == self.__policy:
+                self.__gaps.append((timestamp, symbol))
+
+        self.__timestamp = timestamp
+        self.__last_candles_dict.update(bar_dict)
+        yield aligned_dict
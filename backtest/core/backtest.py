@@ -0,0 +1,78 @@
+from typing import Dict, List
+
+from tqdm import tqdm
+
+from backtest.core.alignment import CandleAligner
+from backtest.core.market import Market
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.core.source import Source
+from backtest.model.constant import AlignmentPolicy, EventType
+from backtest.model.position import Position
+
+
+class Backtest:
+    def __init__(self, conf_path: str, sources_dict: Dict[str, Source] = None, conf_dict: Dict = None):
+        self.__conf_path: str = conf_path
+        self.__market: Market = Market(conf_path, conf_dict)
+        self.__sources_dict: Dict[str, Source] = sources_dict if sources_dict is not None else \
+            Source.from_pairs_configuration(self.__market.conf_dict)
+
+        # states
+        self.__positions: List[Position] = []
+        self.__positions_dict: Dict[int, List[Position]] = {}
+        self.__aligner: CandleAligner = None
+        self.__market.event_bus.subscribe(EventType.NEW_CLOSED_POSITION, self.__on_new_closed_position)
+
+    def __on_new_closed_position(self, position: Position):
+        self.__positions.append(position)
+        self.__positions_dict.setdefault(position.strategy_id, []).append(position)
+
+    def __total(self):
+        try:
+            return max(len(source) for source in self.__sources_dict.values())
+        except TypeError:
+            return None
+
+    def run(self, preload: bool = False, progress: bool = True) -> List[Position]:
+        if preload:
+            self.__run_preloaded(progress)
+        else:
+            self.__run_streaming(progress)
+        return self.__positions
+
+    def __run_preloaded(self, progress: bool):
+        data = self.__market.data
+        data.load_ohlcv({symbol: source.load() for symbol, source in self.__sources_dict.items()})
+        with tqdm(total=self.__total(), disable=not progress) as progress_bar:
+            while data.has_next:
+                self.__market.next()
+                progress_bar.update()
+
+    def __run_streaming(self, progress: bool):
+        data_conf_dict = self.__market.conf_dict['market']['data']
+        policy = data_conf_dict.get('alignment', AlignmentPolicy.FFILL)
+        # a market restored from a snapshot resumes after its last bar
+        self.__aligner = CandleAligner(self.__market.symbols, self.__market.time_frame, policy,
+                                       data_conf_dict.get('fill-limit'), self.__market.data.timestamp)
+        candles_dict = {symbol: source.candles() for symbol, source in self.__sources_dict.items()}
+        for aligned_dict in tqdm(self.__aligner.align(candles_dict), total=self.__total(), disable=not progress):
+            self.__market.next(aligned_dict)
+
+    @property
+    def market(self) -> Market:
+        return self.__market
+
+    @property
+    def aligner(self) -> CandleAligner:
+        return self.__aligner
+
+    @property
+    def positions(self) -> List[Position]:
+        return self.__positions
+
+    def get_positions(self, strategy_id: int) -> List[Position]:
+        return self.__positions_dict.get(strategy_id, [])
+
+    def get_performance_measures(self, strategy_id: int = None, **kwargs) -> PerformanceMeasures:
+        positions = self.__positions if strategy_id is None else self.get_positions(strategy_id)
+        return PerformanceMeasures(positions, **kwargs)
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+from typing import Dict
+
+import numpy as np
+
+from backtest.model.constant import TimeFrame
+
+
+class CandleCache:
+    DTYPE = np.dtype([('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'), ('volume', '<f8')])
+
+    def __init__(self, directory: str, symbol: str, time_frame: TimeFrame):
+        self.__directory: str = directory
+        self.__symbol: str = symbol
+        self.__time_frame: TimeFrame = time_frame
+
+    def __get_path(self, suffix: str) -> str:
+        return os.path.join(self.__directory, self.__symbol, '{}{}'.format(self.__time_frame, suffix))
+
+    @property
+    def candles_path(self) -> str:
+        return self.__get_path('.npy')
+
+    @property
+    def index_path(self) -> str:
+        return self.__get_path('.index.npy')
+
+    @property
+    def metadata_path(self) -> str:
+        return self.__get_path('.json')
+
+    @property
+    def exists(self) -> bool:
+        return all(os.path.exists(path) for path in [self.candles_path, self.index_path, self.metadata_path])
+
+    def write(self, ohlcv: Dict[str, np.ndarray]):
+        timestamps = np.ascontiguousarray(ohlcv['timestamp'], dtype='<i8')
+        if np.any(timestamps % self.__time_frame) or np.any(np.diff(timestamps) <= 0):
+            raise Exception("Timestamps of candles are not valid. (symbol: {}, time frame: {})"
+                            .format(self.__symbol, self.__time_frame))
+
+        candles = np.empty(len(timestamps), dtype=self.DTYPE)
+        for column in self.DTYPE.names:
+            candles[column] = ohlcv[column]
+
+        os.makedirs(os.path.dirname(self.candles_path), exist_ok=True)
+        np.save(self.candles_path, candles)
+        np.save(self.index_path, timestamps)
+        with open(self.metadata_path, 'w') as metadata_file:
+            json.dump({
+                'symbol': self.__symbol,
+                'time-frame': self.__time_frame,
+                'count': len(timestamps),
+                'first-timestamp': int(timestamps[0]) if len(timestamps) else None,
+                'last-timestamp': int(timestamps[-1]) if len(timestamps) else None,
+            }, metadata_file)
+
+    @property
+    def metadata(self) -> Dict:
+        with open(self.metadata_path, 'r') as metadata_file:
+            return json.load(metadata_file)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return np.load(self.index_path, mmap_mode='r')
+
+    @property
+    def candles(self) -> np.ndarray:
+        return np.load(self.candles_path, mmap_mode='r')
+
+    def seek(self, timestamp: int) -> int:
+        # binary search over the memory-mapped index only touches O(log n) pages
+        return int(np.searchsorted(self.timestamps, timestamp, side='left'))
+
+    def read(self, start: int = None, end: int = None) -> Dict[str, np.ndarray]:
+        start_index = self.seek(start) if start is not None else 0
+        end_index = self.seek(end) if end is not None else None
+        timestamps = self.timestamps[start_index:end_index]
+        candles = self.candles[start_index:end_index]
+        ohlcv = {'timestamp': timestamps}
+        for column in self.DTYPE.names:
+            ohlcv[column] = candles[column]
+        return ohlcv
+
+
+def main():
+    from backtest.core.source import Source
+
+    parser = argparse.ArgumentParser(description="Convert raw candles into the binary candle cache.")
+    parser.add_argument('--directory', required=True, help="cache directory shared between backtests")
+    parser.add_argument('--symbol', required=True)
+    parser.add_argument('--time-frame', required=True, type=int, help="time frame of the candles in seconds")
+    parser.add_argument('--type', required=True, choices=['csv', 'parquet', 'numpy'], help="type of the raw source")
+    parser.add_argument('--path', required=True, help="path of the raw source")
+    args = parser.parse_args()
+
+    source = Source.from_configuration({'type': args.type, 'path': args.path})
+    cache = CandleCache(args.directory, args.symbol, args.time_frame)
+    cache.write(source.load())
+    print("{} candles of {} are cached in {}".format(cache.metadata['count'], args.symbol, cache.candles_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,95 @@
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
+import pandas as pd
+
+from backtest.core.indicator import Indicator
 from backtest.core.pair import Pair
 from backtest.model.candle import Candle
-from backtest.model.constant import TimeFrame
+from backtest.model.constant import FillResolution, TimeFrame
+from backtest.util.profiler import Profiler
 
 
 class Data:
     def __init__(self, ):
         self.__time_frame: TimeFrame = None
         self.__time_frames: List[TimeFrame] = None
+        self.__candles_capacity: int = None
+        self.__fill_resolution: FillResolution = None
         self.__pairs_dict: Dict[str, Pair] = None
+        self.profiler: Profiler = None
 
         # states
         self.__timestamp: int = None
+        self.__dataframes_dict: Dict[Tuple[str, TimeFrame, int], pd.DataFrame] = {}
+        self.__arrays_dict: Dict[Tuple[str, TimeFrame, int], Dict[str, np.ndarray]] = {}
+        self.__price_paths_dict: Dict[str, Sequence[float]] = {}
 
         # strategy properties
         self.__strategy_symbol: str = None
         self.__strategy_time_frame: TimeFrame = None
         self.__strategy_candles_limit: int = None
 
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_Data__dataframes_dict'] = {}
+        state['_Data__arrays_dict'] = {}
+        state['profiler'] = None
+        return state
+
     def load_configuration(self, conf_dict: Dict):
         self.__time_frame: TimeFrame = conf_dict['time-frame']
         self.__time_frames: List[TimeFrame] = conf_dict['time-frames']
+        self.__candles_capacity: int = conf_dict.get('candles-capacity')
+        self.__fill_resolution: FillResolution = conf_dict.get('fill-resolution', FillResolution.ORDER)
         self.__pairs_dict: Dict[str, Pair] = {}
         for pair_conf_dict in conf_dict['pairs']:
             pair = Pair()
-            pair.load_configuration(pair_conf_dict, self.__time_frame, self.__time_frames)
+            pair.load_configuration(pair_conf_dict, self.__time_frame, self.__time_frames, self.__candles_capacity)
             self.__pairs_dict[pair.symbol] = pair
 
-    def next(self, candles_dict: Dict[str, Candle]):
+    def load_ohlcv(self, ohlcv_dict: Dict):
+        for symbol, ohlcv in ohlcv_dict.items():
+            self.__pairs_dict[symbol].load_ohlcv(ohlcv)
+        self.__timestamp = None
+        self.__clear_views()
+
+    def __clear_views(self):
+        if self.__dataframes_dict:
+            self.__dataframes_dict = {}
+        if self.__arrays_dict:
+            self.__arrays_dict = {}
+
+    def next(self, candles_dict: Dict[str, Candle] = None):
+        self.__clear_views()
+        if candles_dict is None:
+            self.__next_bulk()
+            return
+
+        # the clock follows the candles, so bars missing for every symbol do not shift it
+        self.__timestamp = next(iter(candles_dict.values())).timestamp
+        if self.profiler is not None:
+            for symbol, candle in candles_dict.items():
+                self.profiler.start('pair.next {}'.format(symbol))
+                self.__pairs_dict[symbol].next(candle)
+                self.profiler.stop()
+            return
+        for symbol, candle in candles_dict.items():
+            self.__pairs_dict[symbol].next(candle)
+
+    def __next_bulk(self):
         if self.timestamp is None:
-            self.__timestamp = list(candles_dict.values())[0].timestamp - self.time_frame
+            self.__timestamp = min(pair.next_timestamp for pair in self.pairs if pair.next_timestamp is not None) \
+                               - self.time_frame
 
         self.__timestamp += self.__time_frame
-        for symbol, candle in candles_dict.items():
-            self.__pairs_dict[symbol].next(candle)
+        for pair in self.__pairs_dict.values():
+            if self.__timestamp == pair.next_timestamp:
+                pair.next()
+
+    @property
+    def has_next(self) -> bool:
+        return any(pair.next_timestamp is not None for pair in self.__pairs_dict.values())
 
     @property
     def time_frame(self) -> TimeFrame:
@@ -65,11 +120,61 @@ class Data:
         last_candle = self.__pairs_dict[symbol].last_candle
         return last_candle.low <= price <= last_candle.high
 
+    @property
+    def fill_resolution(self) -> FillResolution:
+        return self.__fill_resolution
+
+    def set_price_path(self, symbol: str, prices: Sequence[float]):
+        # sub-bar prices (ticks or lower time frame closes) of the coming bar, dropped once its orders are matched
+        self.__price_paths_dict[symbol] = prices
+
+    def clear_price_paths(self):
+        if self.__price_paths_dict:
+            self.__price_paths_dict = {}
+
+    def get_price_path(self, symbol: str) -> Sequence[float]:
+        if symbol in self.__price_paths_dict:
+            return self.__price_paths_dict[symbol]
+        # without sub-bars the extreme nearer to the open is assumed to be met first
+        candle = self.__pairs_dict[symbol].last_candle
+        if candle.high - candle.open <= candle.open - candle.low:
+            return candle.open, candle.high, candle.low, candle.close
+        return candle.open, candle.low, candle.high, candle.close
+
     def get_market_price(self, symbol: str) -> float:
         return self.__pairs_dict[symbol].last_candle.open
 
-    def get_ohlcv_dataframe(self, symbol: str, time_frame: TimeFrame, limit: int):
-        return self.__pairs_dict[symbol].get_ohlcv_dataframe(time_frame, limit)
+    def get_ohlcv_dataframe(self, symbol: str, time_frame: TimeFrame, limit: int) -> pd.DataFrame:
+        # one frame per bar is shared by all readers, each gets a shallow copy so added columns do not leak
+        key = (symbol, time_frame, limit)
+        df = self.__dataframes_dict.get(key)
+        if df is None:
+            if self.profiler is not None:
+                self.profiler.start('data.ohlcv_dataframe')
+            df = self.__pairs_dict[symbol].get_ohlcv_dataframe(time_frame, limit)
+            self.__dataframes_dict[key] = df
+            if self.profiler is not None:
+                self.profiler.stop()
+        return df.copy(deep=False)
+
+    def get_ohlcv_arrays(self, symbol: str, time_frame: TimeFrame, limit: int) -> Dict[str, np.ndarray]:
+        # the read-only arrays are shared, each reader gets its own dict so added keys do not leak
+        key = (symbol, time_frame, limit)
+        arrays = self.__arrays_dict.get(key)
+        if arrays is None:
+            if self.profiler is not None:
+                self.profiler.start('data.ohlcv_arrays')
+            arrays = self.__pairs_dict[symbol].get_ohlcv_arrays(time_frame, limit)
+            self.__arrays_dict[key] = arrays
+            if self.profiler is not None:
+                self.profiler.stop()
+        return dict(arrays)
+
+    def get_indicator(self, symbol: str, time_frame: TimeFrame, indicator_class: type, **kwargs) -> Indicator:
+        return self.__pairs_dict[symbol].get_indicator(time_frame, indicator_class, **kwargs)
+
+    def get_current_candle(self, symbol: str, time_frame: TimeFrame) -> Candle:
+        return self.__pairs_dict[symbol].get_current_candle(time_frame)
 
     # strategy related methods and properties
     def set_strategy_properties(self, symbol: str, time_frame: TimeFrame, candles_limit: int):
@@ -81,3 +186,11 @@ class Data:
     def ohlcv_dataframe(self):
         df = self.get_ohlcv_dataframe(self.__strategy_symbol, self.__strategy_time_frame, self.__strategy_candles_limit)
         return df
+
+    @property
+    def ohlcv_arrays(self) -> Dict[str, np.ndarray]:
+        return self.get_ohlcv_arrays(self.__strategy_symbol, self.__strategy_time_frame, self.__strategy_candles_limit)
+
+    @property
+    def current_candle(self) -> Candle:
+        return self.get_current_candle(self.__strategy_symbol, self.__strategy_time_frame)
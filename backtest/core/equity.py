@@ -0,0 +1,181 @@
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from backtest.core.data import Data
+from backtest.core.trade import Trade
+from backtest.model.constant import TimeFrame
+from backtest.model.order import Order
+from backtest.model.position import Position
+
+
+class EquityCurve:
+    def __init__(self, strategy_ids: List[int], time_frame: TimeFrame, initial_capital: float = 1000,
+                 fix_equity: float = 1000, capacity: int = 1024):
+        self.__time_frame: TimeFrame = time_frame
+        self.initial_capital: float = initial_capital
+        self.fix_equity: float = fix_equity
+
+        # one row per strategy and a last row for the whole portfolio, columns are bars
+        self.__rows_dict: Dict[int, int] = {}
+        self.__timestamps: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self.__equity: np.ndarray = np.empty((1, capacity), dtype=np.float64)
+        self.__exposure: np.ndarray = np.empty((1, capacity), dtype=np.float64)
+
+        # states
+        self.__length: int = 0
+        self.__realized_profits: np.ndarray = np.zeros(1, dtype=np.float64)
+        self.__trades: Tuple[Trade, ...] = None
+        self.__trades_dict: Dict[Tuple[int, str, TimeFrame], Trade] = {}
+        self.__changed_keys: Set[Tuple[int, str, TimeFrame]] = set()
+        # open positions as profit = slope * mark price + offset, summed per strategy row and symbol
+        self.__contributions_dict: Dict[Tuple[int, str], Dict[Tuple[int, str, TimeFrame], Tuple[float, float]]] = {}
+        self.__open_dict: Dict[Tuple[int, str], Tuple[float, float]] = {}
+        for strategy_id in strategy_ids:
+            self.add_strategy(strategy_id)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __grow(self):
+        capacity = 2 * len(self.__timestamps)
+        self.__timestamps = np.resize(self.__timestamps, capacity)
+        self.__equity = np.concatenate([self.__equity, np.empty_like(self.__equity)], axis=1)
+        self.__exposure = np.concatenate([self.__exposure, np.empty_like(self.__exposure)], axis=1)
+
+    def add_strategy(self, strategy_id: int):
+        # strategies added later start flat at the initial capital
+        if strategy_id in self.__rows_dict:
+            return
+        row = len(self.__rows_dict)
+        self.__rows_dict[strategy_id] = row
+        self.__equity = np.insert(self.__equity, row, self.initial_capital, axis=0)
+        self.__exposure = np.insert(self.__exposure, row, 0, axis=0)
+        self.__realized_profits = np.insert(self.__realized_profits, row, 0)
+
+    def get_profit(self, position: Position, mark_price: float) -> Tuple[float, float]:
+        # profit and signed exposure of one position, sized with the fixed equity as Position.set_equity does
+        slope, offset = self.__get_line(position)
+        exposure = slope * mark_price
+        return (exposure + offset) / 100 * self.fix_equity, exposure / 100 * self.fix_equity
+
+    @staticmethod
+    def __get_line(position: Position) -> Tuple[float, float]:
+        entry_price = position.entry_price
+        if not entry_price:
+            return 0, 0
+        exit_percentage = position.exit_percentage
+        open_percentage = position.entry_percentage - exit_percentage
+        offset = -open_percentage * position.side
+        if exit_percentage:
+            offset += exit_percentage * (position.exit_price / entry_price - 1) * position.side
+        return position.side * open_percentage / entry_price, offset
+
+    def add_filled_order(self, order: Order):
+        self.__changed_keys.add((order.strategy_id, order.symbol, order.time_frame))
+
+    def add_closed_position(self, position: Position):
+        if not position.entry_price:
+            return
+        profit = position.profit_percentage / 100 * self.fix_equity
+        self.__realized_profits[self.__rows_dict[position.strategy_id]] += profit
+        self.__realized_profits[-1] += profit
+
+    def __update_open(self, trades: Tuple[Trade, ...]):
+        if trades is not self.__trades:
+            # new trades, after strategies were added or a snapshot restored, are all read once
+            self.__trades = trades
+            self.__trades_dict = {(trade.position.strategy_id, trade.symbol, trade.time_frame): trade
+                                  for trade in trades}
+            self.__changed_keys.update(self.__trades_dict.keys())
+            self.__contributions_dict = {}
+            self.__open_dict = {}
+
+        # only positions changed by a fill are read again, the others keep their contribution
+        for key in self.__changed_keys:
+            trade = self.__trades_dict.get(key)
+            if trade is None:
+                continue
+            cell = (self.__rows_dict[key[0]], key[1])
+            contributions = self.__contributions_dict.setdefault(cell, {})
+            line = self.__get_line(trade.position)
+            if line != (0, 0):
+                contributions[key] = line
+            else:
+                contributions.pop(key, None)
+            if contributions:
+                self.__open_dict[cell] = (sum(slope for slope, _ in contributions.values()),
+                                          sum(offset for _, offset in contributions.values()))
+            else:
+                self.__open_dict.pop(cell, None)
+        self.__changed_keys.clear()
+
+    def update(self, timestamp: int, trades: Tuple[Trade, ...], data: Data):
+        if len(self.__timestamps) <= self.__length:
+            self.__grow()
+        if self.__changed_keys or trades is not self.__trades:
+            self.__update_open(trades)
+
+        column = self.__length
+        rows = len(self.__realized_profits)
+        profits, exposures = [0.0] * rows, [0.0] * rows
+        marks_dict = {}
+        for (row, symbol), (slope, offset) in self.__open_dict.items():
+            mark = marks_dict.get(symbol)
+            if mark is None:
+                mark = marks_dict[symbol] = data.get_last_candle(symbol).close
+            exposure = slope * mark
+            profits[row] += exposure + offset
+            exposures[row] += exposure
+        profits[-1], exposures[-1] = sum(profits), sum(exposures)
+
+        self.__timestamps[column] = timestamp
+        self.__equity[:, column] = self.initial_capital + self.__realized_profits + \
+            np.array(profits) / 100 * self.fix_equity
+        self.__exposure[:, column] = np.array(exposures) / 100 * self.fix_equity
+        self.__length += 1
+
+    def __get_row(self, strategy_id: int = None) -> int:
+        return -1 if strategy_id is None else self.__rows_dict[strategy_id]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.__timestamps[:self.__length]
+
+    def get_equity(self, strategy_id: int = None) -> np.ndarray:
+        return self.__equity[self.__get_row(strategy_id), :self.__length]
+
+    def get_exposure(self, strategy_id: int = None) -> np.ndarray:
+        return self.__exposure[self.__get_row(strategy_id), :self.__length]
+
+    def get_returns(self, strategy_id: int = None) -> np.ndarray:
+        equity = self.get_equity(strategy_id)
+        return np.diff(equity) / equity[:-1] if 1 < len(equity) else np.empty(0)
+
+    @property
+    def periods_per_year(self) -> float:
+        return 365 * 24 * 60 * 60 / self.__time_frame
+
+    def get_sharpe_ratio(self, strategy_id: int = None, risk_free_rate: float = 0) -> float:
+        excess_returns = self.get_returns(strategy_id) - risk_free_rate / self.periods_per_year
+        with np.errstate(all='ignore'):
+            return float(excess_returns.mean() / excess_returns.std() * np.sqrt(self.periods_per_year))
+
+    def get_sortino_ratio(self, strategy_id: int = None, risk_free_rate: float = 0) -> float:
+        excess_returns = self.get_returns(strategy_id) - risk_free_rate / self.periods_per_year
+        downside_deviation = np.sqrt(np.mean(np.minimum(excess_returns, 0) ** 2))
+        with np.errstate(all='ignore'):
+            return float(excess_returns.mean() / downside_deviation * np.sqrt(self.periods_per_year))
+
+    def get_drawdown(self, strategy_id: int = None) -> np.ndarray:
+        equity = self.get_equity(strategy_id)
+        return equity - np.maximum.accumulate(equity)
+
+    def get_maximum_drawdown(self, strategy_id: int = None) -> Tuple[float, float]:
+        equity = self.get_equity(strategy_id)
+        if 0 == len(equity):
+            return 0, 0
+        peaks = np.maximum.accumulate(equity)
+        drawdowns = equity - peaks
+        index = int(np.argmin(drawdowns))
+        return round(float(-drawdowns[index]), 2), round(float(-drawdowns[index] / peaks[index] * 100), 2)
@@ -0,0 +1,166 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Tuple
+
+import numpy as np
+
+from backtest.model.candle import Candle
+
+
+class Indicator(ABC):
+    def __init__(self, history: int = 1000):
+        self.__history: Deque = deque(maxlen=history)
+        self.__value = None
+
+    def update(self, candle: Candle):
+        value = self.compute(candle)
+        self.__value = value
+        if value is not None:
+            self.__history.append(value)
+
+    @abstractmethod
+    def compute(self, candle: Candle):
+        raise NotImplemented()
+
+    @property
+    def value(self):
+        return self.__value
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.array(self.__history)
+
+    @property
+    def is_ready(self) -> bool:
+        return self.__value is not None
+
+
+class SMA(Indicator):
+    def __init__(self, period: int, source: str = 'close', history: int = 1000):
+        super().__init__(history)
+        self.period: int = period
+        self.source: str = source
+
+        # states
+        self.__window: Deque[float] = deque(maxlen=period)
+        self.__sum: float = 0
+
+    def compute(self, candle: Candle) -> float:
+        price = getattr(candle, self.source)
+        if len(self.__window) == self.period:
+            self.__sum -= self.__window[0]
+        self.__window.append(price)
+        self.__sum += price
+        return self.__sum / self.period if len(self.__window) == self.period else None
+
+
+class EMA(Indicator):
+    def __init__(self, period: int, source: str = 'close', history: int = 1000):
+        super().__init__(history)
+        self.period: int = period
+        self.source: str = source
+        self.alpha: float = 2 / (period + 1)
+
+        # states
+        self.__sma: SMA = SMA(period, source, history=1)
+        self.__ema: float = None
+
+    def compute(self, candle: Candle) -> float:
+        if self.__ema is None:
+            # seeded with the simple average of the first period
+            self.__ema = self.__sma.compute(candle)
+        else:
+            self.__ema += self.alpha * (getattr(candle, self.source) - self.__ema)
+        return self.__ema
+
+
+class RSI(Indicator):
+    def __init__(self, period: int = 14, source: str = 'close', history: int = 1000):
+        super().__init__(history)
+        self.period: int = period
+        self.source: str = source
+
+        # states
+        self.__previous_price: float = None
+        self.__count: int = 0
+        self.__average_gain: float = 0
+        self.__average_loss: float = 0
+
+    def compute(self, candle: Candle) -> float:
+        price = getattr(candle, self.source)
+        previous_price, self.__previous_price = self.__previous_price, price
+        if previous_price is None:
+            return None
+
+        change = price - previous_price
+        gain, loss = max(change, 0), max(-change, 0)
+        self.__count += 1
+        if self.__count <= self.period:
+            self.__average_gain += gain / self.period
+            self.__average_loss += loss / self.period
+            if self.__count < self.period:
+                return None
+        else:
+            # wilder smoothing
+            self.__average_gain = (self.__average_gain * (self.period - 1) + gain) / self.period
+            self.__average_loss = (self.__average_loss * (self.period - 1) + loss) / self.period
+
+        if 0 == self.__average_loss:
+            return 100.0
+        return 100 - 100 / (1 + self.__average_gain / self.__average_loss)
+
+
+class ATR(Indicator):
+    def __init__(self, period: int = 14, history: int = 1000):
+        super().__init__(history)
+        self.period: int = period
+
+        # states
+        self.__previous_close: float = None
+        self.__count: int = 0
+        self.__atr: float = 0
+
+    def compute(self, candle: Candle) -> float:
+        if self.__previous_close is None:
+            true_range = candle.high - candle.low
+        else:
+            true_range = max(candle.high - candle.low, abs(candle.high - self.__previous_close),
+                             abs(candle.low - self.__previous_close))
+        self.__previous_close = candle.close
+
+        self.__count += 1
+        if self.__count <= self.period:
+            self.__atr += true_range / self.period
+            return self.__atr if self.__count == self.period else None
+        self.__atr = (self.__atr * (self.period - 1) + true_range) / self.period
+        return self.__atr
+
+
+class BollingerBands(Indicator):
+    def __init__(self, period: int = 20, deviations: float = 2, source: str = 'close', history: int = 1000):
+        super().__init__(history)
+        self.period: int = period
+        self.deviations: float = deviations
+        self.source: str = source
+
+        # states
+        self.__window: Deque[float] = deque(maxlen=period)
+        self.__sum: float = 0
+        self.__squares_sum: float = 0
+
+    def compute(self, candle: Candle) -> Tuple[float, float, float]:
+        price = getattr(candle, self.source)
+        if len(self.__window) == self.period:
+            dropped = self.__window[0]
+            self.__sum -= dropped
+            self.__squares_sum -= dropped * dropped
+        self.__window.append(price)
+        self.__sum += price
+        self.__squares_sum += price * price
+        if len(self.__window) < self.period:
+            return None
+
+        middle = self.__sum / self.period
+        deviation = math.sqrt(max(self.__squares_sum / self.period - middle * middle, 0))
+        return middle, middle + self.deviations * deviation, middle - self.deviations * deviation
@@ -0,0 +1,257 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+from backtest.core.market import Market
+from backtest.model.constant import BackPressurePolicy, EventType
+from backtest.model.order import Order
+from backtest.model.position import Position
+
+
+class Journal(ABC):
+    ORDER_COLUMNS = ['event', 'id', 'strategy_id', 'symbol', 'time_frame', 'side', 'type', 'percentage', 'price',
+                     'stop_price', 'reduce_only', 'comment', 'status', 'open_timestamp', 'close_timestamp',
+                     'filled_price']
+    POSITION_COLUMNS = ['event', 'id', 'strategy_id', 'symbol', 'time_frame', 'side', 'entry_timestamp',
+                        'entry_price', 'entry_percentage', 'exit_timestamp', 'exit_price', 'exit_percentage',
+                        'profit_percentage', 'run_up_percentage', 'drawdown_percentage']
+    ORDER_EVENT_TYPES = [EventType.NEW_OPEN_ORDER, EventType.NEW_FILLED_ORDER, EventType.NEW_CANCELED_ORDER]
+    POSITION_EVENT_TYPES = [EventType.NEW_OPEN_POSITION, EventType.NEW_CLOSED_POSITION]
+
+    def __init__(self, capacity: int = 10000, batch_size: int = 1000, flush_interval: float = 1.0,
+                 policy: BackPressurePolicy = BackPressurePolicy.BLOCK):
+        if policy not in [BackPressurePolicy.BLOCK, BackPressurePolicy.DROP_NEWEST, BackPressurePolicy.DROP_OLDEST]:
+            raise ValueError("Unknown back pressure policy {}".format(policy))
+
+        self.__batch_size: int = batch_size
+        self.__flush_interval: float = flush_interval
+        self.__policy: BackPressurePolicy = policy
+        self.__queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self.__thread: threading.Thread = threading.Thread(target=self.__run, name='journal', daemon=True)
+
+        # states
+        self.__dropped: int = 0
+        self.__written: int = 0
+        self.__error: BaseException = None
+        self.__is_closed: bool = False
+        self.__subscriptions: List[Tuple[Market, int, object]] = []
+
+        # the sink is opened here so that a bad path fails the caller instead of the journal thread
+        self.open_sink()
+        atexit.register(self.close)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    @property
+    def written(self) -> int:
+        return self.__written
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__is_closed
+
+    def attach(self, market: Market, event_types: List[int] = None, strategy_id: int = None, symbol: str = None):
+        event_types = event_types if event_types is not None else \
+            [EventType.NEW_FILLED_ORDER, EventType.NEW_CLOSED_POSITION]
+        for event_type in event_types:
+            # one bound handler per event type, the bar loop only pays for a queue put
+            handler = market.event_bus.subscribe(event_type, lambda item, event_type=event_type:
+                                                 self.put(event_type, item), strategy_id, symbol)
+            self.__subscriptions.append((market, event_type, handler))
+        return self
+
+    def detach(self):
+        for market, event_type, handler in self.__subscriptions:
+            market.event_bus.unsubscribe(event_type, handler)
+        self.__subscriptions = []
+
+    def put(self, event_type: int, item):
+        if self.__is_closed:
+            raise Exception("Journal is closed")
+        self.__raise_error()
+
+        # rows are taken now, the bar loop keeps changing the orders and positions afterwards
+        if event_type in self.ORDER_EVENT_TYPES:
+            record = ('orders', self.get_order_row(event_type, item))
+        else:
+            record = ('positions', self.get_position_row(event_type, item))
+        if BackPressurePolicy.BLOCK == self.__policy:
+            self.__queue.put(record)
+            return
+        while True:
+            try:
+                self.__queue.put_nowait(record)
+                return
+            except queue.Full:
+                if BackPressurePolicy.DROP_NEWEST == self.__policy:
+                    self.__dropped += 1
+                    return
+            try:
+                self.__queue.get_nowait()
+                self.__queue.task_done()
+                self.__dropped += 1
+            except queue.Empty:
+                pass
+
+    def flush(self):
+        self.__queue.join()
+        self.__raise_error()
+
+    def close(self):
+        if self.__is_closed:
+            return
+        self.detach()
+        self.__is_closed = True
+        self.__queue.put(None)
+        self.__thread.join()
+        atexit.unregister(self.close)
+        self.__raise_error()
+
+    def __raise_error(self):
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise Exception("Journal failed to write records") from error
+
+    def __run(self):
+        try:
+            is_running = True
+            while is_running:
+                try:
+                    records = [self.__queue.get(timeout=self.__flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(records) < self.__batch_size:
+                    try:
+                        records.append(self.__queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if None in records:
+                    is_running = False
+                try:
+                    self.__write([record for record in records if record is not None])
+                except BaseException as error:
+                    self.__error = error
+                finally:
+                    for _ in records:
+                        self.__queue.task_done()
+        finally:
+            try:
+                self.close_sink()
+            except BaseException as error:
+                self.__error = error
+
+    def __write(self, records: List[Tuple[str, Tuple]]):
+        rows_dict = {'orders': [], 'positions': []}
+        for table, row in records:
+            rows_dict[table].append(row)
+        if rows_dict['orders']:
+            self.write_rows('orders', self.ORDER_COLUMNS, rows_dict['orders'])
+        if rows_dict['positions']:
+            self.write_rows('positions', self.POSITION_COLUMNS, rows_dict['positions'])
+        self.commit_sink()
+        self.__written += len(records)
+
+    @staticmethod
+    def get_order_row(event_type: int, order: Order) -> Tuple:
+        return (event_type, order.id, order.strategy_id, order.symbol, order.time_frame, order.side, order.type,
+                order.percentage, order.price, order.stop_price, order.reduce_only, order.comment, order.status,
+                order.open_timestamp, order.close_timestamp, order.filled_price)
+
+    @staticmethod
+    def get_position_row(event_type: int, position: Position) -> Tuple:
+        # a position closed by exits alone has no entry price to measure its profit against
+        is_closed = EventType.NEW_CLOSED_POSITION == event_type and position.entry_price is not None
+        return (event_type, str(position.id), position.strategy_id, position.symbol, position.time_frame,
+                position.side, position.entry_timestamp, position.entry_price, position.entry_percentage,
+                position.exit_timestamp, position.exit_price, position.exit_percentage,
+                position.profit_percentage if is_closed else None,
+                position.run_up_percentage if is_closed else None,
+                position.drawdown_percentage if is_closed else None)
+
+    # the sink is opened by the caller's thread, written and closed by the journal thread
+    @abstractmethod
+    def open_sink(self):
+        raise NotImplemented()
+
+    @abstractmethod
+    def write_rows(self, table: str, columns: List[str], rows: List[Tuple]):
+        raise NotImplemented()
+
+    def commit_sink(self):
+        pass
+
+    @abstractmethod
+    def close_sink(self):
+        raise NotImplemented()
+
+
+class FileJournal(Journal):
+    def __init__(self, path: str, **kwargs):
+        self.__path: str = path
+        self.__file = None
+        super().__init__(**kwargs)
+
+    def open_sink(self):
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__file = open(self.__path, 'a')
+
+    def write_rows(self, table: str, columns: List[str], rows: List[Tuple]):
+        lines = [json.dumps({'table': table, **dict(zip(columns, row))}) for row in rows]
+        self.__file.write('\n'.join(lines) + '\n')
+
+    def commit_sink(self):
+        self.__file.flush()
+
+    def close_sink(self):
+        if self.__file is not None:
+            self.__file.close()
+
+    @staticmethod
+    def read(path: str) -> List[Dict]:
+        with open(path, 'r') as journal_file:
+            return [json.loads(line) for line in journal_file if line.strip()]
+
+
+class SQLiteJournal(Journal):
+    def __init__(self, path: str, **kwargs):
+        self.__path: str = path
+        self.__connection: sqlite3.Connection = None
+        super().__init__(**kwargs)
+
+    def open_sink(self):
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # only the journal thread uses the connection once it is opened
+        self.__connection = sqlite3.connect(self.__path, check_same_thread=False)
+        for table, columns in [('orders', self.ORDER_COLUMNS), ('positions', self.POSITION_COLUMNS)]:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS {} ({})".format(table, ', '.join(columns)))
+        self.__connection.commit()
+
+    def write_rows(self, table: str, columns: List[str], rows: List[Tuple]):
+        self.__connection.executemany("INSERT INTO {} ({}) VALUES ({})"
+                                      .format(table, ', '.join(columns), ', '.join('?' * len(columns))), rows)
+
+    def commit_sink(self):
+        self.__connection.commit()
+
+    def close_sink(self):
+        if self.__connection is not None:
+            self.__connection.close()
@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Set, Tuple
+
+from backtest.core.market import Market
+from backtest.core.source import Source
+from backtest.model.candle import Candle
+
+
+class CandleStream(ABC):
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Candle]]:
+        raise NotImplemented()
+
+
+class MemoryCandleStream(CandleStream):
+    def __init__(self, candles: Iterable[Tuple[str, Candle]], delay: float = 0):
+        self.candles: Iterable[Tuple[str, Candle]] = candles
+        self.delay: float = delay
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Candle]]:
+        for symbol, candle in self.candles:
+            await asyncio.sleep(self.delay)
+            yield symbol, candle
+
+
+class SourceCandleStream(CandleStream):
+    def __init__(self, sources_dict: Dict[str, Source], batch_size: int = 1000, buffer_size: int = 8):
+        self.sources_dict: Dict[str, Source] = sources_dict
+        self.batch_size: int = batch_size
+        self.buffer_size: int = buffer_size
+
+    def __iterate(self) -> Iterator[Tuple[str, Candle]]:
+        iterators = [zip(itertools.repeat(symbol), source.candles()) for symbol, source in self.sources_dict.items()]
+        return heapq.merge(*iterators, key=lambda item: item[1].timestamp)
+
+    def __produce(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, stop: threading.Event):
+        # files are read on a worker thread and handed over in batches, so the event loop never waits on disk
+        try:
+            batch = []
+            for item in self.__iterate():
+                batch.append(item)
+                if self.batch_size <= len(batch):
+                    asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+                    batch = []
+                if stop.is_set():
+                    return
+            if batch:
+                asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+        except BaseException as error:
+            asyncio.run_coroutine_threadsafe(queue.put(error), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Candle]]:
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        stop = threading.Event()
+        thread = threading.Thread(target=self.__produce, args=(loop, queue, stop), daemon=True)
+        thread.start()
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                for item in batch:
+                    yield item
+        finally:
+            stop.set()
+            while thread.is_alive():
+                # drain so a blocked producer can observe the stop flag
+                if not queue.empty():
+                    queue.get_nowait()
+                await asyncio.sleep(0)
+
+
+class LiveMarket:
+    def __init__(self, market: Market, stream: CandleStream, deadline: float = 5.0, executor: Executor = None):
+        self.__market: Market = market
+        self.__stream: CandleStream = stream
+        self.__deadline: float = deadline
+        self.__executor: Executor = executor
+        self.__symbols: Set[str] = set(market.symbols)
+
+        # states
+        self.__timestamp: int = None
+        self.__last_candles_dict: Dict[str, Candle] = {}
+        self.__bars: int = 0
+        self.__late_candles: int = 0
+        self.__filled_candles: int = 0
+
+    @property
+    def market(self) -> Market:
+        return self.__market
+
+    @property
+    def timestamp(self) -> int:
+        return self.__timestamp
+
+    @property
+    def bars(self) -> int:
+        return self.__bars
+
+    @property
+    def late_candles(self) -> int:
+        return self.__late_candles
+
+    @property
+    def filled_candles(self) -> int:
+        return self.__filled_candles
+
+    def __get_candles_dict(self, candles_dict: Dict[str, Candle], timestamp: int) -> Dict[str, Candle]:
+        # symbols that missed the deadline are carried with a flat candle at their last close
+        for symbol in self.__market.symbols:
+            if symbol not in candles_dict and symbol in self.__last_candles_dict:
+                close = self.__last_candles_dict[symbol].close
+                candles_dict[symbol] = Candle(timestamp, close, close, close, close, 0)
+                self.__filled_candles += 1
+        self.__last_candles_dict.update(candles_dict)
+        return {symbol: candles_dict[symbol] for symbol in self.__market.symbols if symbol in candles_dict}
+
+    async def __step(self, executor: Executor, timestamp: int, candles_dict: Dict[str, Candle]):
+        candles_dict = self.__get_candles_dict(candles_dict, timestamp)
+        self.__timestamp = timestamp
+        await asyncio.get_running_loop().run_in_executor(executor, self.__market.next, candles_dict)
+        self.__bars += 1
+
+    def __add_candle(self, loop: asyncio.AbstractEventLoop, symbol: str, candle: Candle,
+                     pending_dict: Dict[int, Dict[str, Candle]], deadlines_dict: Dict[int, float],
+                     timestamps: List[int]):
+        # candles of other symbols would complete bars before the market's own symbols arrived
+        if symbol not in self.__symbols:
+            return
+        if self.__timestamp is not None and candle.timestamp <= self.__timestamp:
+            self.__late_candles += 1
+            return
+        if candle.timestamp not in pending_dict:
+            pending_dict[candle.timestamp] = {}
+            deadlines_dict[candle.timestamp] = loop.time() + self.__deadline
+            heapq.heappush(timestamps, candle.timestamp)
+        pending_dict[candle.timestamp][symbol] = candle
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        executor = self.__executor if self.__executor is not None else ThreadPoolExecutor(max_workers=1)
+        symbols_count = len(self.__market.symbols)
+        pending_dict: Dict[int, Dict[str, Candle]] = {}
+        deadlines_dict: Dict[int, float] = {}
+        timestamps: List[int] = []
+
+        iterator = self.__stream.__aiter__()
+        next_task = None
+        try:
+            is_running = True
+            while is_running or timestamps:
+                if is_running:
+                    if next_task is None:
+                        next_task = asyncio.ensure_future(iterator.__anext__())
+                    timeout = max(deadlines_dict[timestamps[0]] - loop.time(), 0) if timestamps else None
+                    done, _ = await asyncio.wait([next_task], timeout=timeout)
+                    if next_task in done:
+                        task, next_task = next_task, None
+                        try:
+                            symbol, candle = task.result()
+                        except StopAsyncIteration:
+                            is_running = False
+                        else:
+                            self.__add_candle(loop, symbol, candle, pending_dict, deadlines_dict, timestamps)
+
+                # bars are released in timestamp order, once complete or once their deadline passed
+                while timestamps:
+                    timestamp = timestamps[0]
+                    candles_dict = pending_dict[timestamp]
+                    if is_running and len(candles_dict) < symbols_count and loop.time() < deadlines_dict[timestamp]:
+                        break
+                    heapq.heappop(timestamps)
+                    del pending_dict[timestamp], deadlines_dict[timestamp]
+                    await self.__step(executor, timestamp, candles_dict)
+        finally:
+            if next_task is not None:
+                next_task.cancel()
+            if self.__executor is None:
+                executor.shutdown(wait=False)
+
+
+async def run_markets(live_markets: List[LiveMarket]):
+    await asyncio.gather(*[live_market.run() for live_market in live_markets])
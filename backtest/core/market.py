@@ -1,56 +1,247 @@
 import importlib
 import inspect
+import itertools
 import json
 import pathlib
+import pickle
 import sys
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 
 from backtest.core.data import Data
+from backtest.core.equity import EquityCurve
 from backtest.core.strategy import Strategy
+from backtest.core.trade import Trade
 from backtest.model.candle import Candle
 from backtest.model.constant import TimeFrame, EventType
-from backtest.util.event import Event
+from backtest.model.order import Order
+from backtest.util.event import BoundEvent, EventBus
+from backtest.util.profiler import Profiler
 
 
 class Market:
-    def __init__(self, conf_path: str):
+    def __init__(self, conf_path: str, conf_dict: Dict = None):
         self.__conf_path: str = conf_path
-        self.__events_dict: [int, Event] = {
-            EventType.NEW_OPEN_ORDER: Event(),
-            EventType.NEW_FILLED_ORDER: Event(),
-            EventType.NEW_CANCELED_ORDER: Event(),
-            EventType.NEW_OPEN_POSITION: Event(),
-            EventType.NEW_CLOSED_POSITION: Event(),
+        self.__conf_dict: Dict = conf_dict
+        self.__event_bus: EventBus = EventBus([EventType.NEW_OPEN_ORDER, EventType.NEW_FILLED_ORDER,
+                                               EventType.NEW_CANCELED_ORDER, EventType.NEW_OPEN_POSITION,
+                                               EventType.NEW_CLOSED_POSITION])
+        self.__events_dict: Dict[int, BoundEvent] = {
+            EventType.NEW_OPEN_ORDER: BoundEvent(self.__event_bus, EventType.NEW_OPEN_ORDER, 'order'),
+            EventType.NEW_FILLED_ORDER: BoundEvent(self.__event_bus, EventType.NEW_FILLED_ORDER, 'order'),
+            EventType.NEW_CANCELED_ORDER: BoundEvent(self.__event_bus, EventType.NEW_CANCELED_ORDER, 'order'),
+            EventType.NEW_OPEN_POSITION: BoundEvent(self.__event_bus, EventType.NEW_OPEN_POSITION, 'position'),
+            EventType.NEW_CLOSED_POSITION: BoundEvent(self.__event_bus, EventType.NEW_CLOSED_POSITION, 'position'),
         }
 
         self.__data: Data = None
         self.__strategies_dict: Dict[int, Strategy] = None
+        self.__strategy_classes_dict: Dict[str, List[type]] = {}
+
+        # dispatch schedule, compiled on the first bar after strategies are added
+        self.__trades: Tuple[Trade, ...] = None
+        self.__time_frames: Tuple[TimeFrame, ...] = None
+        self.__calls: Tuple[Tuple[Strategy, str, TimeFrame], ...] = None
+        self.__schedule: Dict[Tuple[bool, ...], Tuple[Tuple[Strategy, str, TimeFrame], ...]] = None
+        self.__equity_curve: EquityCurve = None
+        self.__profiler: Profiler = None
         self.__load_configurations()
 
     def __load_configurations(self):
-        with open(self.__conf_path, 'r') as conf_file:
-            conf_dict = json.load(conf_file)
+        if self.__conf_dict is None:
+            with open(self.__conf_path, 'r') as conf_file:
+                self.__conf_dict = json.load(conf_file)
+        conf_dict = self.__conf_dict
 
         self.__data = Data()
         self.__data.load_configuration(conf_dict['market']['data'])
 
         self.__strategies_dict: Dict[int, Strategy] = {}
         module_dir = conf_dict['strategy']['module-dir']
-        sys.path.append(module_dir)
+        if module_dir not in sys.path:
+            sys.path.append(module_dir)
         for strategy_dict in conf_dict['strategy']['files']:
-            file_path = strategy_dict['file-path']
+            if 'variants' in strategy_dict:
+                for variant_dict in strategy_dict['variants']:
+                    self.add_strategy(self.get_variant_dict(strategy_dict, variant_dict))
+            else:
+                self.add_strategy(strategy_dict)
+
+    @staticmethod
+    def get_variant_dict(strategy_dict: Dict, variant_dict: Dict) -> Dict:
+        conf_dict = {key: value for key, value in strategy_dict.items() if 'variants' != key}
+        conf_dict.update(variant_dict)
+        conf_dict['inputs'] = {**strategy_dict['inputs'], **variant_dict.get('inputs', {})}
+        return conf_dict
+
+    def __get_strategy_classes(self, file_path: str) -> List[type]:
+        if file_path not in self.__strategy_classes_dict:
             file_name = pathlib.Path(file_path).stem
             module = importlib.import_module(file_name)
-            for name, cls in inspect.getmembers(module, inspect.isclass):
-                if file_name == cls.__module__:
-                    strategy = cls(**strategy_dict['inputs'])
-                    strategy.load_configuration(strategy_dict, self.__data, self.__events_dict)
-                    self.__strategies_dict[strategy.id] = strategy
+            self.__strategy_classes_dict[file_path] = [cls for name, cls in inspect.getmembers(module, inspect.isclass)
+                                                       if file_name == cls.__module__]
+        return self.__strategy_classes_dict[file_path]
+
+    def add_strategy(self, strategy_dict: Dict) -> List[Strategy]:
+        strategies = []
+        for cls in self.__get_strategy_classes(strategy_dict['file-path']):
+            if strategy_dict['id'] in self.__strategies_dict:
+                raise Exception("There is already a strategy with id {}".format(strategy_dict['id']))
+
+            strategy = cls(**strategy_dict['inputs'])
+            strategy.load_configuration(strategy_dict, self.__data, self.__event_bus)
+            self.__strategies_dict[strategy.id] = strategy
+            strategies.append(strategy)
+            if self.__equity_curve is not None:
+                self.__equity_curve.add_strategy(strategy.id)
+
+        self.__trades = None
+        self.__schedule = None
+        return strategies
+
+    def __compile_schedule(self):
+        trades, calls = [], []
+        for strategy in self.__strategies_dict.values():
+            trades.extend(strategy.trades)
+            for symbol, time_frame in itertools.product(strategy.symbols, strategy.time_frames):
+                calls.append((strategy, symbol, time_frame))
+
+        self.__trades = tuple(trades)
+        self.__time_frames = tuple(sorted(set(time_frame for _, _, time_frame in calls)))
+        self.__calls = tuple(calls)
+        self.__schedule = {}
+
+    def __get_calls(self, timestamp: int) -> Tuple[Tuple[Strategy, str, TimeFrame], ...]:
+        # calls are grouped by the set of time frames closing on the bar, each group keeps the strategies' order
+        closing = tuple(0 == timestamp % time_frame for time_frame in self.__time_frames)
+        calls = self.__schedule.get(closing)
+        if calls is None:
+            calls = tuple(call for call in self.__calls if 0 == timestamp % call[2])
+            self.__schedule[closing] = calls
+        return calls
+
+    def next(self, candles_dict: Dict[str, Candle] = None, price_paths_dict: Dict[str, Sequence[float]] = None):
+        # candles are used as given: ordering, duplicates, gap filling and fill-limit belong to the caller
+        # (CandleAligner in Backtest's streaming runner, LiveMarket for streams). Pair only rejects timestamps off
+        # the time frame grid.
+        if self.__profiler is not None:
+            self.__next_profiled(candles_dict, price_paths_dict)
+            return
 
-    def next(self, candles_dict: Dict[str, Candle]):
         self.__data.next(candles_dict)
-        for strategy in self.strategies:
-            strategy.pre_next()
+        # sub-bar paths given here or set with Data.set_price_path before the call are used to match this bar
+        if price_paths_dict is not None:
+            for symbol, prices in price_paths_dict.items():
+                self.__data.set_price_path(symbol, prices)
+        if self.__schedule is None:
+            self.__compile_schedule()
+
+        # orders are matched on every bar, strategies only run on the bars closing their time frame
+        for trade in self.__trades:
+            trade.next()
+        self.__data.clear_price_paths()
+
+        timestamp = self.__data.timestamp
+        for strategy, symbol, time_frame in self.__get_calls(timestamp):
+            strategy.dispatch(symbol, time_frame)
+
+        if self.__equity_curve is not None:
+            self.__equity_curve.update(timestamp, self.__trades, self.__data)
+        self.__event_bus.flush()
+
+    def __next_profiled(self, candles_dict: Dict[str, Candle] = None,
+                        price_paths_dict: Dict[str, Sequence[float]] = None):
+        # same steps as next, each one wrapped in a profiler stage
+        profiler = self.__profiler
+        profiler.start_bar()
+        profiler.start('data.next')
+        self.__data.next(candles_dict)
+        if price_paths_dict is not None:
+            for symbol, prices in price_paths_dict.items():
+                self.__data.set_price_path(symbol, prices)
+        profiler.stop()
+        if self.__schedule is None:
+            self.__compile_schedule()
+
+        profiler.start('trade.next')
+        for trade in self.__trades:
+            profiler.start('{} {}'.format(trade.symbol, trade.time_frame))
+            trade.next()
+            profiler.stop()
+        self.__data.clear_price_paths()
+        profiler.stop()
+
+        timestamp = self.__data.timestamp
+        for strategy, symbol, time_frame in self.__get_calls(timestamp):
+            profiler.start('strategy {} {} {}'.format(strategy.id, symbol, time_frame))
+            strategy.dispatch(symbol, time_frame)
+            profiler.stop()
+
+        if self.__equity_curve is not None:
+            profiler.start('equity_curve.update')
+            self.__equity_curve.update(timestamp, self.__trades, self.__data)
+            profiler.stop()
+        profiler.start('event_bus.flush')
+        self.__event_bus.flush()
+        profiler.stop()
+        profiler.stop_bar(timestamp)
+
+    def enable_profiler(self, per_bar: bool = False) -> Profiler:
+        self.__profiler = Profiler(per_bar)
+        self.__data.profiler = self.__profiler
+        return self.__profiler
+
+    def disable_profiler(self):
+        self.__profiler = None
+        self.__data.profiler = None
+
+    @property
+    def profiler(self) -> Profiler:
+        return self.__profiler
+
+    def enable_equity_curve(self, initial_capital: float = 1000, fix_equity: float = 1000,
+                            capacity: int = 1024) -> EquityCurve:
+        if self.__equity_curve is not None:
+            self.__event_bus.unsubscribe(EventType.NEW_FILLED_ORDER, self.__equity_curve.add_filled_order)
+            self.__event_bus.unsubscribe(EventType.NEW_CLOSED_POSITION, self.__equity_curve.add_closed_position)
+        self.__equity_curve = EquityCurve(list(self.__strategies_dict.keys()), self.time_frame, initial_capital,
+                                          fix_equity, capacity)
+        self.__event_bus.subscribe(EventType.NEW_FILLED_ORDER, self.__equity_curve.add_filled_order)
+        self.__event_bus.subscribe(EventType.NEW_CLOSED_POSITION, self.__equity_curve.add_closed_position)
+        return self.__equity_curve
+
+    @property
+    def equity_curve(self) -> EquityCurve:
+        return self.__equity_curve
+
+    def snapshot(self) -> bytes:
+        # candle buffers, indicators, order books, positions and strategy attributes are shared through one pickle
+        state = {'data': self.__data, 'strategies': self.__strategies_dict, 'next-order-id': Order.get_next_id()}
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, snapshot: bytes):
+        state = pickle.loads(snapshot)
+        self.__data = state['data']
+        self.__strategies_dict = state['strategies']
+        for strategy in self.__strategies_dict.values():
+            for trade in strategy.trades:
+                trade.event_bus = self.__event_bus
+        Order.set_next_id(max(state['next-order-id'], Order.get_next_id()))
+        self.__data.profiler = self.__profiler
+
+        self.__trades = None
+        self.__schedule = None
+
+    def save_snapshot(self, path: str):
+        with open(path, 'wb') as snapshot_file:
+            snapshot_file.write(self.snapshot())
+
+    def load_snapshot(self, path: str):
+        with open(path, 'rb') as snapshot_file:
+            self.restore(snapshot_file.read())
+
+    @property
+    def conf_dict(self) -> Dict:
+        return self.__conf_dict
 
     @property
     def data(self) -> Data:
@@ -60,6 +251,9 @@ class Market:
     def strategies(self) -> List[Strategy]:
         return list(self.__strategies_dict.values())
 
+    def get_strategy(self, strategy_id: int) -> Strategy:
+        return self.__strategies_dict[strategy_id]
+
     @property
     def time_frame(self) -> TimeFrame:
         return self.__data.time_frame
@@ -69,21 +263,25 @@ class Market:
         return self.__data.symbols
 
     @property
-    def on_new_open_order(self) -> Event:
+    def event_bus(self) -> EventBus:
+        return self.__event_bus
+
+    @property
+    def on_new_open_order(self) -> BoundEvent:
         return self.__events_dict[EventType.NEW_OPEN_ORDER]
 
     @property
-    def on_new_filled_order(self) -> Event:
+    def on_new_filled_order(self) -> BoundEvent:
         return self.__events_dict[EventType.NEW_FILLED_ORDER]
 
     @property
-    def on_new_canceled_order(self) -> Event:
+    def on_new_canceled_order(self) -> BoundEvent:
         return self.__events_dict[EventType.NEW_CANCELED_ORDER]
 
     @property
-    def on_new_open_position(self) -> Event:
+    def on_new_open_position(self) -> BoundEvent:
         return self.__events_dict[EventType.NEW_OPEN_POSITION]
 
     @property
-    def on_new_closed_position(self) -> Event:
+    def on_new_closed_position(self) -> BoundEvent:
         return self.__events_dict[EventType.NEW_CLOSED_POSITION]
@@ -0,0 +1,87 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.model.constant import ResamplingMethod
+
+
+class MonteCarlo:
+    COLUMNS = ['profit', 'drawdown', 'bars', 'time_frame']
+
+    def __init__(self, measures: PerformanceMeasures, simulations: int = 10000,
+                 method: ResamplingMethod = ResamplingMethod.BOOTSTRAP, chunk_size: int = 500, seed: int = None,
+                 workers: int = None):
+        if method not in [ResamplingMethod.BOOTSTRAP, ResamplingMethod.PERMUTATION]:
+            raise ValueError("Unknown resampling method {}".format(method))
+
+        self.__measures: PerformanceMeasures = measures
+        self.__simulations: int = simulations
+        self.__method: ResamplingMethod = method
+        self.__chunk_size: int = chunk_size
+        self.__seed: int = seed
+        self.__workers: int = workers
+
+        # states
+        self.__results: pd.DataFrame = None
+
+    @property
+    def results(self) -> pd.DataFrame:
+        return self.__results
+
+    def run(self) -> pd.DataFrame:
+        columns = {name: np.ascontiguousarray(self.__measures.columns[name]) for name in self.COLUMNS}
+        sizes = [min(self.__chunk_size, self.__simulations - start)
+                 for start in range(0, self.__simulations, self.__chunk_size)]
+        # one seed per chunk, so the results do not depend on how chunks are spread over processes
+        seeds = np.random.SeedSequence(self.__seed).spawn(len(sizes))
+        arguments = (itertools.repeat(columns), itertools.repeat(self.__method), sizes, seeds,
+                     itertools.repeat(self.__measures.initial_capital),
+                     itertools.repeat(self.__measures.risk_free_rate))
+
+        if self.__workers is None or 1 == self.__workers:
+            results = list(map(simulate, *arguments))
+        else:
+            with ProcessPoolExecutor(self.__workers) as executor:
+                results = list(executor.map(simulate, *arguments))
+
+        self.__results = pd.DataFrame({name: np.concatenate([result[name] for result in results])
+                                       for name in results[0]})
+        return self.__results
+
+    def get_confidence_intervals(self, levels: Tuple[float, ...] = (0.05, 0.5, 0.95)) -> pd.DataFrame:
+        if self.__results is None:
+            self.run()
+        return self.__results.quantile(list(levels))
+
+
+def simulate(columns: Dict[str, np.ndarray], method: ResamplingMethod, size: int, seed: np.random.SeedSequence,
+             initial_capital: float, risk_free_rate: float) -> Dict[str, np.ndarray]:
+    generator = np.random.default_rng(seed)
+    trades = len(columns['profit'])
+    if 0 == trades:
+        return {'net_profit': np.zeros(size), 'maximum_drawdown': np.zeros(size), 'sharpe_ratio': np.full(size, np.nan)}
+
+    if ResamplingMethod.BOOTSTRAP == method:
+        indices = generator.integers(0, trades, (size, trades))
+    else:
+        indices = generator.permuted(np.broadcast_to(np.arange(trades), (size, trades)), axis=1)
+    profits = columns['profit'][indices]
+
+    # same drawdown definition as PerformanceMeasures, evaluated on every simulated sequence at once
+    equity = initial_capital + np.cumsum(profits, axis=1)
+    equity_before = np.concatenate([np.full((size, 1), initial_capital), equity[:, :-1]], axis=1)
+    maximum_equity_before = np.concatenate([np.zeros((size, 1)),
+                                            np.maximum.accumulate(np.maximum(equity, 0), axis=1)[:, :-1]], axis=1)
+    drawdowns = maximum_equity_before - equity_before - columns['drawdown'][indices]
+    maximum_drawdown = np.maximum(drawdowns.max(axis=1), 0)
+
+    days = np.round(columns['bars'][indices].sum(axis=1) * columns['time_frame'][0] / (24 * 60 * 60), 2)
+    net_profit = profits.sum(axis=1)
+    with np.errstate(all='ignore'):
+        sharpe_ratio = (net_profit / days - risk_free_rate / 365 * days) / profits.std(axis=1) * np.sqrt(365)
+
+    return {'net_profit': net_profit, 'maximum_drawdown': maximum_drawdown, 'sharpe_ratio': sharpe_ratio}
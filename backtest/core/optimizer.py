@@ -0,0 +1,150 @@
+import copy
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource, Source
+
+# candles shared with the worker processes, attached once per worker by attach_ohlcv
+_shared_ohlcv_dict: Dict[str, Dict[str, np.ndarray]] = None
+_shared_memories: List[shared_memory.SharedMemory] = None
+
+
+class Optimizer:
+    def __init__(self, conf_path: str, strategy_id: int, sources_dict: Dict[str, Source] = None,
+                 workers: int = None, batch_size: int = 50, **measures_kwargs):
+        self.__conf_path: str = conf_path
+        self.__strategy_id: int = strategy_id
+        self.__sources_dict: Dict[str, Source] = sources_dict
+        self.__workers: int = workers
+        self.__batch_size: int = batch_size
+        self.__measures_kwargs: Dict = measures_kwargs if measures_kwargs else {'fix_equity': 1000}
+
+        with open(conf_path, 'r') as conf_file:
+            self.__conf_dict: Dict = json.load(conf_file)
+
+    @property
+    def conf_dict(self) -> Dict:
+        return self.__conf_dict
+
+    @staticmethod
+    def grid(parameters: Dict[str, List]) -> List[Dict]:
+        names = list(parameters.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*parameters.values())]
+
+    @staticmethod
+    def __scale(parameters: Dict, samples: np.ndarray) -> List[Dict]:
+        inputs_list = []
+        for row in samples:
+            inputs = {}
+            for (name, space), sample in zip(parameters.items(), row):
+                if isinstance(space, list):
+                    inputs[name] = space[min(int(sample * len(space)), len(space) - 1)]
+                else:
+                    low, high = space
+                    value = float(low + sample * (high - low))
+                    inputs[name] = int(round(value)) if isinstance(low, int) and isinstance(high, int) else value
+            inputs_list.append(inputs)
+        return inputs_list
+
+    @staticmethod
+    def random(parameters: Dict, samples: int, seed: int = None) -> List[Dict]:
+        generator = np.random.default_rng(seed)
+        return Optimizer.__scale(parameters, generator.random((samples, len(parameters))))
+
+    @staticmethod
+    def latin_hypercube(parameters: Dict, samples: int, seed: int = None) -> List[Dict]:
+        generator = np.random.default_rng(seed)
+        strata = np.stack([generator.permutation(samples) for _ in parameters], axis=1)
+        return Optimizer.__scale(parameters, (strata + generator.random(strata.shape)) / samples)
+
+    def get_conf_dict(self, inputs_list: List[Dict]) -> Tuple[Dict, List[int]]:
+        conf_dict = copy.deepcopy(self.__conf_dict)
+        strategy_dicts = conf_dict['strategy']['files']
+        for strategy_dict in strategy_dicts:
+            if self.__strategy_id == strategy_dict['id']:
+                # every combination becomes a variant so that a batch shares one market pass
+                first_id = max(strategy_dict['id'] for strategy_dict in strategy_dicts) + 1
+                strategy_ids = list(range(first_id, first_id + len(inputs_list)))
+                strategy_dict['variants'] = [{'id': strategy_id, 'inputs': inputs}
+                                             for strategy_id, inputs in zip(strategy_ids, inputs_list)]
+                conf_dict['strategy']['files'] = [strategy_dict]
+                return conf_dict, strategy_ids
+        raise Exception("There is no strategy with id {}".format(self.__strategy_id))
+
+    def run(self, inputs_list: List[Dict]) -> pd.DataFrame:
+        sources_dict = self.__sources_dict if self.__sources_dict is not None else \
+            Source.from_pairs_configuration(self.__conf_dict)
+        shared_memories, descriptors = share_ohlcv({symbol: source.load() for symbol, source in sources_dict.items()})
+        workers = self.__workers if self.__workers is not None else os.cpu_count()
+        batch_size = max(min(self.__batch_size, math.ceil(len(inputs_list) / workers)), 1)
+        batches = [inputs_list[index:index + batch_size] for index in range(0, len(inputs_list), batch_size)]
+        try:
+            with ProcessPoolExecutor(workers, initializer=attach_ohlcv, initargs=(descriptors,)) as executor:
+                conf_dicts, strategy_ids_list = zip(*[self.get_conf_dict(batch) for batch in batches])
+                results = executor.map(run_backtest, itertools.repeat(self.__conf_path), conf_dicts,
+                                       strategy_ids_list, itertools.repeat(self.__measures_kwargs))
+                summaries = list(itertools.chain.from_iterable(results))
+        finally:
+            for memory in shared_memories:
+                memory.close()
+                memory.unlink()
+
+        return pd.DataFrame([{**inputs, **summary} for inputs, summary in zip(inputs_list, summaries)])
+
+
+def share_ohlcv(ohlcv_dict: Dict[str, Dict[str, np.ndarray]]) \
+        -> Tuple[List[shared_memory.SharedMemory], Dict[str, Tuple[str, int]]]:
+    shared_memories, descriptors = [], {}
+    for symbol, ohlcv in ohlcv_dict.items():
+        length = len(ohlcv['timestamp'])
+        memory = shared_memory.SharedMemory(create=True, size=max(len(Source.COLUMNS) * length * 8, 1))
+        for column, array in get_shared_ohlcv(memory, length).items():
+            array[:] = ohlcv[column]
+        shared_memories.append(memory)
+        descriptors[symbol] = (memory.name, length)
+    return shared_memories, descriptors
+
+
+def get_shared_ohlcv(memory: shared_memory.SharedMemory, length: int) -> Dict[str, np.ndarray]:
+    arrays = {}
+    for index, column in enumerate(Source.COLUMNS):
+        dtype = np.int64 if 'timestamp' == column else np.float64
+        arrays[column] = np.ndarray(length, dtype=dtype, buffer=memory.buf, offset=index * length * 8)
+    return arrays
+
+
+def attach_ohlcv(descriptors: Dict[str, Tuple[str, int]]):
+    global _shared_ohlcv_dict, _shared_memories
+    _shared_ohlcv_dict, _shared_memories = {}, []
+    for symbol, (name, length) in descriptors.items():
+        memory = shared_memory.SharedMemory(name=name)
+        _shared_memories.append(memory)
+        _shared_ohlcv_dict[symbol] = get_shared_ohlcv(memory, length)
+
+
+def get_shared_sources(start: int = None, end: int = None) -> Dict[str, MemorySource]:
+    # windows are views over the shared candles, [start, end) in timestamps
+    sources_dict = {}
+    for symbol, ohlcv in _shared_ohlcv_dict.items():
+        timestamps = ohlcv['timestamp']
+        start_index = 0 if start is None else int(np.searchsorted(timestamps, start))
+        end_index = len(timestamps) if end is None else int(np.searchsorted(timestamps, end))
+        sources_dict[symbol] = MemorySource({column: array[start_index:end_index] for column, array in ohlcv.items()})
+    return sources_dict
+
+
+def run_backtest(conf_path: str, conf_dict: Dict, strategy_ids: List[int], measures_kwargs: Dict,
+                 start: int = None, end: int = None) -> List[Dict[str, float]]:
+    backtest = Backtest(conf_path, get_shared_sources(start, end), conf_dict)
+    backtest.run(preload=True, progress=False)
+    return [backtest.get_performance_measures(strategy_id, **measures_kwargs).summary()
+            for strategy_id in strategy_ids]
@@ -0,0 +1,122 @@
+import bisect
+import math
+from typing import Dict, List, Sequence, Set, Tuple
+
+from backtest.model.order import Order
+
+
+class OrderBook:
+    def __init__(self):
+        self.__orders_dict: Dict[int, Order] = {}
+
+        # triggers are kept sorted by (price, order id) so a bar only visits the orders priced inside [low, high]
+        self.__market_ids: List[int] = []
+        self.__limit_triggers: List[Tuple[float, int]] = []
+        self.__stop_triggers: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.__orders_dict)
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self.__orders_dict
+
+    def __getitem__(self, order_id: int) -> Order:
+        return self.__orders_dict[order_id]
+
+    @property
+    def orders_dict(self) -> Dict[int, Order]:
+        return self.__orders_dict
+
+    def __insert(self, order: Order):
+        if order.stop_price and not order.is_activated:
+            bisect.insort(self.__stop_triggers, (order.stop_price, order.id))
+        elif order.price is None:
+            bisect.insort(self.__market_ids, order.id)
+        else:
+            bisect.insort(self.__limit_triggers, (order.price, order.id))
+
+    @staticmethod
+    def __discard(triggers: List, trigger):
+        index = bisect.bisect_left(triggers, trigger)
+        if index < len(triggers) and triggers[index] == trigger:
+            del triggers[index]
+
+    def add(self, order: Order):
+        self.__orders_dict[order.id] = order
+        self.__insert(order)
+
+    def remove(self, order_id: int) -> Order:
+        order = self.__orders_dict.pop(order_id)
+        if order.stop_price and not order.is_activated:
+            self.__discard(self.__stop_triggers, (order.stop_price, order.id))
+        elif order.price is None:
+            self.__discard(self.__market_ids, order.id)
+        else:
+            self.__discard(self.__limit_triggers, (order.price, order.id))
+        return order
+
+    @staticmethod
+    def __get_touched(triggers: List[Tuple[float, int]], low: float, high: float) -> List[Tuple[float, int]]:
+        start = bisect.bisect_left(triggers, (low, -1))
+        end = bisect.bisect_right(triggers, (high, float('inf')), start)
+        return triggers[start:end]
+
+    @staticmethod
+    def __get_touch_time(path: Sequence[float], price: float, start: float = 0) -> float:
+        # position along the path where the price is first met, segment k spans [k, k + 1]
+        for index in range(int(start), len(path) - 1):
+            begin, end = path[index], path[index + 1]
+            if min(begin, end) <= price <= max(begin, end):
+                time = index if begin == end else index + (price - begin) / (end - begin)
+                if start <= time:
+                    return time
+        return math.inf
+
+    def __get_path_order(self, candidate_ids: List[int], touched_stop_ids: Set[int], path: Sequence[float]) -> \
+            Tuple[List[int], Set[int]]:
+        times_dict, resting_ids = {}, set()
+        for order_id in candidate_ids:
+            order = self.__orders_dict[order_id]
+            if order_id in touched_stop_ids:
+                time = self.__get_touch_time(path, order.stop_price)
+                # a stop limit order can only fill after its stop price was met
+                if order.price is not None:
+                    time = self.__get_touch_time(path, order.price, time)
+                    if math.isinf(time):
+                        resting_ids.add(order_id)
+            elif order.price is None:
+                time = 0
+            else:
+                time = self.__get_touch_time(path, order.price)
+            times_dict[order_id] = time
+        return sorted(candidate_ids, key=lambda order_id: (times_dict[order_id], order_id)), resting_ids
+
+    def match(self, low: float, high: float, path: Sequence[float] = None) -> List[Order]:
+        # orders are resolved in creation order (order id), the same order in which they were scanned before
+        if 0 == len(self.__orders_dict):
+            return []
+
+        touched_stop_ids = set(order_id for _, order_id in self.__get_touched(self.__stop_triggers, low, high))
+        touched_limit_ids = set(order_id for _, order_id in self.__get_touched(self.__limit_triggers, low, high))
+        candidate_ids = sorted(touched_stop_ids.union(touched_limit_ids, self.__market_ids))
+
+        # with a price path only bars where several triggers compete are resolved by the time they were met
+        resting_ids = set()
+        if path is not None and 1 < len(touched_stop_ids) + len(touched_limit_ids):
+            candidate_ids, resting_ids = self.__get_path_order(candidate_ids, touched_stop_ids, path)
+
+        filled_orders = []
+        for order_id in candidate_ids:
+            order = self.__orders_dict[order_id]
+            if order_id in touched_stop_ids:
+                self.__discard(self.__stop_triggers, (order.stop_price, order.id))
+                order.is_activated = True
+                # activated stop limit orders rest until their limit price is touched
+                if order.price is not None and (order_id in resting_ids or not low <= order.price <= high):
+                    bisect.insort(self.__limit_triggers, (order.price, order.id))
+                    continue
+                del self.__orders_dict[order_id]
+            else:
+                self.remove(order_id)
+            filled_orders.append(order)
+        return filled_orders
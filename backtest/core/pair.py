@@ -1,9 +1,13 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+from backtest.core.indicator import Indicator
 from backtest.model.candle import Candle
 from backtest.model.constant import TimeFrame
+from backtest.util.candle_aggregator import CandleAggregator, resample
+from backtest.util.ohlcv_buffer import OHLCVBuffer
 
 
 class Pair:
@@ -14,60 +18,153 @@ class Pair:
 
         self.__time_frames: List[TimeFrame] = None
         self.__time_frame: int = None
+        self.__candles_capacity: int = None
 
         # states
         self.__index: int = None
         self.__timestamp: int = None
         self.__last_candle: Candle = None
-        self.__source_ohlcv_dataframe: pd.DataFrame = None
-        self.__data_ohlcv_dataframes_dict: Dict[int, pd.DataFrame] = None
-
-    def load_configuration(self, conf_dict: Dict, time_frame: int, time_frames: List[TimeFrame]):
+        self.__aggregators_dict: Dict[int, CandleAggregator] = None
+        self.__data_ohlcv_buffers_dict: Dict[int, OHLCVBuffer] = None
+        self.__indicators_dict: Dict[Tuple, Indicator] = {}
+        self.__time_frame_indicators_dict: Dict[int, List[Indicator]] = {}
+        self.__indicator_ends_dict: Dict[int, int] = {}
+
+        # bulk loaded states
+        self.__source_ohlcv_buffer: OHLCVBuffer = None
+        self.__source_timestamps: np.ndarray = None
+        self.__close_indices_dict: Dict[int, np.ndarray] = None
+
+    def load_configuration(self, conf_dict: Dict, time_frame: int, time_frames: List[TimeFrame],
+                           candles_capacity: int = None):
         self.__symbol: str = conf_dict['symbol']
         self.__price_precision: int = conf_dict['price-precision']
         self.__quantity_precision: int = conf_dict['quantity-precision']
 
         self.__time_frame: int = time_frame
         self.__time_frames: List[TimeFrame] = time_frames
+        self.__candles_capacity: int = candles_capacity
 
         # states
-        df = pd.DataFrame(columns=['timestamp', 'datetime', 'open', 'high', 'low', 'close', 'volume'])
-        self.__source_ohlcv_dataframe = df
-        self.__data_ohlcv_dataframes_dict = {}
+        self.__aggregators_dict = {}
+        self.__data_ohlcv_buffers_dict = {}
+        for time_frame in self.__time_frames:
+            self.__aggregators_dict[time_frame] = CandleAggregator(time_frame, self.__time_frame)
+            self.__data_ohlcv_buffers_dict[time_frame] = OHLCVBuffer(self.__candles_capacity)
+
+    def load_ohlcv(self, ohlcv):
+        source = OHLCVBuffer.from_ohlcv(ohlcv)
+        timestamps = source.timestamps
+        if np.any(timestamps % self.__time_frame) or np.any(np.diff(timestamps) <= 0):
+            raise Exception("Timestamps of candles are not valid. (symbol: {}, time frame: {})"
+                            .format(self.__symbol, self.__time_frame))
+
+        self.__source_ohlcv_buffer = source
+        self.__source_timestamps = timestamps
+        self.__close_indices_dict = {}
         for time_frame in self.__time_frames:
-            df = pd.DataFrame(columns=['timestamp', 'datetime', 'open', 'high', 'low', 'close', 'volume'])
-            self.__data_ohlcv_dataframes_dict[time_frame] = df
+            buffer, close_indices = resample(source, time_frame, self.__time_frame)
+            self.__data_ohlcv_buffers_dict[time_frame] = buffer
+            self.__close_indices_dict[time_frame] = close_indices
+
+        self.__index = 0
+        self.__timestamp = None
+        self.__last_candle = None
+        self.__indicators_dict = {}
+        self.__time_frame_indicators_dict = {}
+        self.__indicator_ends_dict = {}
+
+    def next(self, candle: Candle = None):
+        if candle is None:
+            candle = Candle(*self.__source_ohlcv_buffer.get_row(self.__index))
+            self.__index += 1
+            self.__timestamp = candle.timestamp
+            self.__last_candle = candle
+            for time_frame in self.__time_frame_indicators_dict:
+                self.__update_indicators(time_frame)
+            return
 
-    def next(self, candle: Candle):
         if self.__timestamp is None:
             self.__index = 0
-            self.__timestamp = candle.timestamp - self.__time_frame
 
         self.__index += 1
-        self.__timestamp += self.__time_frame
+        self.__timestamp = candle.timestamp
         self.__last_candle = candle
         if 0 == candle.timestamp % self.__time_frame:
-            self.__source_ohlcv_dataframe.loc[len(self.__source_ohlcv_dataframe)] = candle.to_list
-            for time_frame, dataframe in self.__data_ohlcv_dataframes_dict.items():
-                step = time_frame // self.__time_frame
-                if 0 == (candle.timestamp + self.__time_frame) % time_frame:
-                    window = self.__source_ohlcv_dataframe.iloc[-step:]
-                    if step == len(window):
-                        timestamp = window.timestamp.iloc[0]
-                        datetime = window.datetime.iloc[0]
-                        open = window.open.iloc[0]
-                        high = window.high.max()
-                        low = window.low.min()
-                        close = window.close.iloc[-1]
-                        volume = window.volume.sum()
-                        dataframe.loc[len(dataframe)] = [timestamp, datetime, open, high, low, close, volume]
+            for time_frame, aggregator in self.__aggregators_dict.items():
+                closed_candle = aggregator.next(candle)
+                if closed_candle is not None:
+                    self.__data_ohlcv_buffers_dict[time_frame].append(
+                        closed_candle.timestamp, closed_candle.open, closed_candle.high, closed_candle.low,
+                        closed_candle.close, closed_candle.volume)
+                    if time_frame in self.__time_frame_indicators_dict:
+                        self.__update_indicators(time_frame)
         else:
-            print(self.__timestamp, candle.timestamp, self.__time_frame)
             raise Exception("Timestamp of candle is not valid. (market timestamp: {:}, candle timestamp: {})"
                             .format(self.__timestamp, candle.timestamp))
 
+    def __get_end(self, time_frame: TimeFrame) -> int:
+        if self.__source_ohlcv_buffer is None:
+            return None
+        return int(np.searchsorted(self.__close_indices_dict[time_frame], self.__index - 1, side='right'))
+
+    def __update_indicators(self, time_frame: TimeFrame):
+        buffer = self.__data_ohlcv_buffers_dict[time_frame]
+        end = self.__get_end(time_frame)
+        end = len(buffer) if end is None else end
+        start = self.__indicator_ends_dict[time_frame]
+        if start == end:
+            return
+
+        for index in range(start, end):
+            candle = Candle(*buffer.get_row(index))
+            for indicator in self.__time_frame_indicators_dict[time_frame]:
+                indicator.update(candle)
+        self.__indicator_ends_dict[time_frame] = end
+
+    def get_indicator(self, time_frame: TimeFrame, indicator_class: type, **kwargs) -> Indicator:
+        key = (time_frame, indicator_class, tuple(sorted(kwargs.items())))
+        indicator = self.__indicators_dict.get(key)
+        if indicator is None:
+            indicator = indicator_class(**kwargs)
+            # a new indicator is warmed up on the candles already closed
+            buffer = self.__data_ohlcv_buffers_dict[time_frame]
+            end = self.__get_end(time_frame)
+            end = len(buffer) if end is None else end
+            for index in range(end - len(buffer.get_arrays(end=end)['timestamp']), end):
+                indicator.update(Candle(*buffer.get_row(index)))
+
+            self.__indicators_dict[key] = indicator
+            self.__time_frame_indicators_dict.setdefault(time_frame, []).append(indicator)
+            self.__indicator_ends_dict.setdefault(time_frame, end)
+        return indicator
+
     def get_ohlcv_dataframe(self, time_frame: TimeFrame, limit: int) -> pd.DataFrame:
-        return self.__data_ohlcv_dataframes_dict[time_frame].iloc[self.__index - limit: self.__index]
+        return self.__data_ohlcv_buffers_dict[time_frame].get_dataframe(limit, self.__get_end(time_frame))
+
+    def get_ohlcv_arrays(self, time_frame: TimeFrame, limit: int) -> Dict[str, np.ndarray]:
+        return self.__data_ohlcv_buffers_dict[time_frame].get_arrays(limit, self.__get_end(time_frame))
+
+    def get_current_candle(self, time_frame: TimeFrame) -> Candle:
+        if self.__source_ohlcv_buffer is None:
+            return self.__aggregators_dict[time_frame].current_candle
+
+        aggregator = CandleAggregator(time_frame, self.__time_frame)
+        timestamps = self.__source_timestamps[:self.__index]
+        start = int(np.searchsorted(timestamps, self.__timestamp - self.__timestamp % time_frame))
+        for index in range(start, self.__index):
+            aggregator.next(Candle(*self.__source_ohlcv_buffer.get_row(index)))
+        return aggregator.current_candle
+
+    @property
+    def is_bulk_loaded(self) -> bool:
+        return self.__source_ohlcv_buffer is not None
+
+    @property
+    def next_timestamp(self) -> int:
+        if self.__source_timestamps is None or len(self.__source_timestamps) <= self.__index:
+            return None
+        return int(self.__source_timestamps[self.__index])
 
     @property
     def last_candle(self) -> Candle:
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 from backtest.model.constant import PositionSide
@@ -9,15 +9,19 @@ from tabulate import tabulate
 class PerformanceMeasures:
     def __init__(self, positions: List[Position], initial_capital: int = 1000, fix_quantity: float = None,
                  fix_equity: float = None, risk_free_rate: float = 0.002, fee_rate: float = 0.0004):
-        self.positions: List[Position] = positions
+        self.__positions: List[Position] = positions
 
         self.initial_capital: int = initial_capital
-        self.fix_quantity: float = fix_quantity
-        self.fix_equity: float = fix_equity
+        self.__fix_quantity: float = fix_quantity
+        self.__fix_equity: float = fix_equity
 
         self.risk_free_rate: float = risk_free_rate
         self.fee_rate: float = fee_rate
 
+        # memoized columns and measures, keyed on the identity and length of the positions list
+        self.__cache: Dict[str, object] = {}
+        self.__cache_key: Tuple[int, int] = None
+
         self.assign_quantity()
 
     def assign_quantity(self):
@@ -32,12 +36,79 @@ class PerformanceMeasures:
         else:
             raise ValueError("Either fix_quantity or fix_equity must be not None.")
 
+        self.__cache = {}
+
+    @property
+    def positions(self) -> List[Position]:
+        return self.__positions
+
+    @positions.setter
+    def positions(self, positions: List[Position]):
+        self.__positions = positions
+        self.assign_quantity()
+
+    @property
+    def fix_quantity(self) -> float:
+        return self.__fix_quantity
+
+    @fix_quantity.setter
+    def fix_quantity(self, fix_quantity: float):
+        self.__fix_quantity = fix_quantity
+        self.assign_quantity()
+
+    @property
+    def fix_equity(self) -> float:
+        return self.__fix_equity
+
+    @fix_equity.setter
+    def fix_equity(self, fix_equity: float):
+        self.__fix_equity = fix_equity
+        self.assign_quantity()
+
+    def __memoize(self, name: str, function):
+        cache_key = (id(self.__positions), len(self.__positions))
+        if cache_key != self.__cache_key:
+            if self.__cache_key is not None and self.__cache_key[0] == cache_key[0]:
+                # positions appended in place still need their quantity
+                for position in self.__positions[self.__cache_key[1]:]:
+                    self.__assign_position_quantity(position)
+            self.__cache = {}
+            self.__cache_key = cache_key
+        if name not in self.__cache:
+            self.__cache[name] = function()
+        return self.__cache[name]
+
+    def __assign_position_quantity(self, position: Position):
+        if self.fix_quantity is not None:
+            position.set_quantity(self.fix_quantity)
+        else:
+            position.set_equity(self.fix_equity)
+
+    def __get_columns(self) -> Dict[str, np.ndarray]:
+        rows = [(position.side, position.bars, position.profit, position.profit_percentage, position.run_up,
+                 position.drawdown, position.entry_timestamp, position.exit_timestamp, position.time_frame)
+                for position in self.positions]
+        dtype = [('side', np.int64), ('bars', np.int64), ('profit', np.float64), ('profit_percentage', np.float64),
+                 ('run_up', np.float64), ('drawdown', np.float64), ('entry_timestamp', np.int64),
+                 ('exit_timestamp', np.int64), ('time_frame', np.int64)]
+        table = np.array(rows, dtype=dtype)
+        columns = {name: np.ascontiguousarray(table[name]) for name in table.dtype.names}
+        columns['long'] = PositionSide.LONG == columns['side']
+        columns['short'] = PositionSide.SHORT == columns['side']
+        for column in columns.values():
+            column.flags.writeable = False
+        return columns
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return self.__memoize('columns', self.__get_columns)
+
     def value2tuple(self, value: float) -> Tuple[float, float]:
         return round(value, 2), round((value / self.initial_capital) * 100, 2)
 
     @property
     def bars(self) -> np.array:
-        return np.array([position.bars for position in self.positions])
+        return self.columns['bars']
 
     @property
     def days(self) -> float:
@@ -45,23 +116,23 @@ class PerformanceMeasures:
 
     @property
     def sides(self) -> np.array:
-        return np.array([position.side for position in self.positions])
+        return self.columns['side']
 
     @property
     def profits(self) -> np.array:
-        return np.array([position.profit for position in self.positions])
+        return self.columns['profit']
 
     @property
     def longs(self) -> np.array:
-        return self.profits[PositionSide.LONG == self.sides]
+        return self.__memoize('longs', lambda: self.profits[self.columns['long']])
 
     @property
     def shorts(self) -> np.array:
-        return self.profits[PositionSide.SHORT == self.sides]
+        return self.__memoize('shorts', lambda: self.profits[self.columns['short']])
 
     @property
     def profits_percentage(self):
-        return np.array([position.profit_percentage for position in self.positions])
+        return self.columns['profit_percentage']
 
     @property
     def net_profit(self) -> Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]:
@@ -87,37 +158,45 @@ class PerformanceMeasures:
 
         return all_tuple, long_tuple, short_tuple
 
-    @property
-    def maximum_run_up(self) -> Tuple[float, float]:
-        equity, minimum_equity, maximum_run_up = self.initial_capital, self.initial_capital, 0
-        for position in self.positions:
-            run_up = round(equity - minimum_equity + position.run_up, 2)
-            maximum_run_up = max(maximum_run_up, run_up)
-
-            equity += position.profit
-            minimum_equity = min(minimum_equity, equity)
+    def __get_maximum_run_up(self) -> Tuple[float, float]:
+        columns = self.columns
+        equity = self.initial_capital + np.cumsum(columns['profit'])
+        equity_before = np.r_[self.initial_capital, equity[:-1]]
+        minimum_equity_before = np.minimum.accumulate(equity_before)
+        run_ups = np.round(equity_before - minimum_equity_before + columns['run_up'], 2)
+        maximum_run_up = max(0, float(run_ups.max())) if len(run_ups) else 0
 
         run_up_tuple = self.value2tuple(maximum_run_up)
         return run_up_tuple
 
     @property
-    def maximum_drawdown(self) -> Tuple[float, float, int]:
-        equity, maximum_equity, maximum_equity_timestamp = self.initial_capital, 0, 0
-        maximum_drawdown, maximum_drawdown_duration = 0, 0
-        for position in self.positions:
-            drawdown = round(maximum_equity - equity - position.drawdown, 2)
-            maximum_drawdown = max(maximum_drawdown, drawdown)
-            drawdown_duration = int((position.exit_timestamp - maximum_equity_timestamp) / position.time_frame)
-            maximum_drawdown_duration = max(maximum_drawdown_duration, drawdown_duration)
-
-            equity = round(equity + position.profit, 2)
-            maximum_equity = max(maximum_equity, equity)
-            if equity == maximum_equity:
-                maximum_equity_timestamp = position.entry_timestamp
+    def maximum_run_up(self) -> Tuple[float, float]:
+        return self.__memoize('maximum_run_up', self.__get_maximum_run_up)
+
+    def __get_maximum_drawdown(self) -> Tuple[float, float, int]:
+        columns = self.columns
+        equity = np.round(self.initial_capital + np.cumsum(columns['profit']), 2)
+        maximum_equity = np.maximum.accumulate(np.maximum(equity, 0))
+        equity_before = np.r_[self.initial_capital, equity[:-1]]
+        maximum_equity_before = np.r_[0, maximum_equity[:-1]]
+
+        # timestamp of the entry of the last position that closed on a new equity high
+        indices = np.maximum.accumulate(np.where(equity == maximum_equity, np.arange(len(equity)), -1))
+        timestamps = np.where(0 <= indices, columns['entry_timestamp'][indices], 0)
+        timestamps_before = np.r_[0, timestamps[:-1]]
+
+        drawdowns = np.round(maximum_equity_before - equity_before - columns['drawdown'], 2)
+        durations = ((columns['exit_timestamp'] - timestamps_before) / columns['time_frame']).astype(int)
+        maximum_drawdown = max(0, float(drawdowns.max())) if len(drawdowns) else 0
+        maximum_drawdown_duration = max(0, int(durations.max())) if len(durations) else 0
 
         drawdown_tuple = self.value2tuple(maximum_drawdown)
         return *drawdown_tuple, maximum_drawdown_duration
 
+    @property
+    def maximum_drawdown(self) -> Tuple[float, float, int]:
+        return self.__memoize('maximum_drawdown', self.__get_maximum_drawdown)
+
     @property
     def buy_and_hold_return(self) -> Tuple[float, float]:
         profit = round((self.positions[-1].exit_price / self.positions[0].entry_price - 1) * self.initial_capital, 2)
@@ -253,6 +332,25 @@ class PerformanceMeasures:
 
         return all, long, short
 
+    def summary(self) -> Dict[str, float]:
+        if 0 == len(self.positions):
+            return {'net_profit': 0, 'net_profit_percentage': 0, 'maximum_drawdown': 0,
+                    'maximum_drawdown_percentage': 0, 'sharpe_ratio': np.nan, 'sortino_ratio': np.nan,
+                    'profit_factor': np.nan, 'total_closed_trades': 0, 'wining_ratio': np.nan}
+
+        with np.errstate(all='ignore'):
+            return {
+                'net_profit': self.net_profit[0][0],
+                'net_profit_percentage': self.net_profit[0][1],
+                'maximum_drawdown': self.maximum_drawdown[0],
+                'maximum_drawdown_percentage': self.maximum_drawdown[1],
+                'sharpe_ratio': self.sharpe_ratio,
+                'sortino_ratio': self.sortino_ratio,
+                'profit_factor': np.divide(self.gross_profit[0][0], self.gross_loss[0][0]),
+                'total_closed_trades': self.total_closed_trades[0],
+                'wining_ratio': round(self.number_wining_trades[0] / self.total_closed_trades[0] * 100, 2),
+            }
+
     def tabulate(self):
         headers = ["Measure", "All", "Long", "Short"]
         values = [
@@ -0,0 +1,109 @@
+from typing import List
+
+import numpy as np
+
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.model.constant import OrderStatus, PositionSide, TimeFrame
+from backtest.model.order import Order
+from backtest.model.position import Position
+from backtest.util.ohlcv_buffer import OHLCVBuffer
+
+
+class SignalBacktest:
+    def __init__(self, symbol: str, time_frame: TimeFrame, ohlcv, strategy_id: int = None,
+                 price_precision: int = None, quantity_precision: int = None):
+        self.__symbol: str = symbol
+        self.__time_frame: TimeFrame = time_frame
+        self.__strategy_id: int = strategy_id
+        self.__price_precision: int = price_precision
+        self.__quantity_precision: int = quantity_precision
+
+        arrays = OHLCVBuffer.from_ohlcv(ohlcv).get_arrays()
+        self.__timestamps: np.ndarray = arrays['timestamp']
+        self.__open: np.ndarray = arrays['open']
+        self.__high: np.ndarray = arrays['high']
+        self.__low: np.ndarray = arrays['low']
+
+        # states
+        self.__positions: List[Position] = []
+
+    def __get_order(self, side: int, price: float, stop_price: float, reduce_only: bool, open_index: int,
+                    close_index: int, filled_price: float) -> Order:
+        order = Order(side, 100, price, stop_price, reduce_only, '')
+        order.strategy_id = self.__strategy_id
+        order.symbol = self.__symbol
+        order.time_frame = self.__time_frame
+        order.status = OrderStatus.FILLED
+        order.is_activated = True
+        order.open_timestamp = int(self.__timestamps[open_index])
+        order.close_timestamp = int(self.__timestamps[close_index])
+        order.filled_price = float(filled_price)
+        return order
+
+    def __get_first_touch(self, price: float, start: int, end: int) -> int:
+        if price is None or np.isnan(price) or not price or end <= start:
+            return end
+        touched = np.flatnonzero((self.__low[start:end] <= price) & (price <= self.__high[start:end]))
+        return start + int(touched[0]) if len(touched) else end
+
+    def run(self, entries: np.ndarray, exits: np.ndarray = None, side: PositionSide = PositionSide.LONG,
+            stop_loss: np.ndarray = None, take_profit: np.ndarray = None) -> List[Position]:
+        length = len(self.__timestamps)
+        # a signal on bar i is acted on with a market order that fills at the open of bar i + 1
+        entry_indices = np.flatnonzero(np.asarray(entries, dtype=bool)[:length - 1])
+        exit_indices = np.flatnonzero(np.asarray(exits, dtype=bool)[:length - 1]) if exits is not None \
+            else np.empty(0, dtype=np.int64)
+
+        self.__positions = []
+        cursor, met_start = 0, 0
+        while True:
+            entry_position = np.searchsorted(entry_indices, cursor)
+            if len(entry_indices) <= entry_position:
+                break
+            signal_index = int(entry_indices[entry_position])
+            entry_index = signal_index + 1
+
+            # exit orders are placed once the entry is filled, so they can only trigger from the following bar
+            exit_position = np.searchsorted(exit_indices, entry_index)
+            signal_exit_index = int(exit_indices[exit_position]) + 1 if exit_position < len(exit_indices) else length
+            stop_price = float(stop_loss[entry_index]) if stop_loss is not None else None
+            limit_price = float(take_profit[entry_index]) if take_profit is not None else None
+            stop_index = self.__get_first_touch(stop_price, entry_index + 1, signal_exit_index)
+            limit_index = self.__get_first_touch(limit_price, entry_index + 1, signal_exit_index)
+
+            # an exit signal cancels the resting orders. On a bar touching both exits the stop loss fills, as with ORDER
+            # resolution when it is placed before the take profit. ORDER resolution then also fills the take profit
+            # into an empty position, which is not reproduced here.
+            exit_index = min(signal_exit_index, stop_index, limit_index)
+            if length <= exit_index:
+                break
+            if exit_index == signal_exit_index:
+                exit_order = self.__get_order(-side, None, None, True, exit_index - 1, exit_index,
+                                              self.__open[exit_index])
+            elif exit_index == stop_index:
+                exit_order = self.__get_order(-side, None, stop_price, True, entry_index, exit_index,
+                                              self.__open[exit_index])
+            else:
+                exit_order = self.__get_order(-side, limit_price, None, True, entry_index, exit_index, limit_price)
+
+            position = Position(self.__strategy_id, self.__symbol, self.__time_frame)
+            position.price_precision = self.__price_precision
+            position.quantity_precision = self.__quantity_precision
+            position.add_entry_order(self.__get_order(side, None, None, False, signal_index, entry_index,
+                                                      self.__open[entry_index]))
+            position.add_exit_order(exit_order)
+            # met prices cover the bars since the previous position was closed, same as Trade.next
+            position.maximum_met_price = float(self.__high[met_start:exit_index].max())
+            position.minimum_met_price = float(self.__low[met_start:exit_index].min())
+            self.__positions.append(position)
+
+            cursor, met_start = exit_index, exit_index
+
+        return self.__positions
+
+    @property
+    def positions(self) -> List[Position]:
+        return self.__positions
+
+    def get_performance_measures(self, **kwargs) -> PerformanceMeasures:
+        return PerformanceMeasures(self.__positions, **kwargs)
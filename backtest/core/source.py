@@ -0,0 +1,134 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from backtest.core.cache import CandleCache
+from backtest.model.candle import Candle
+
+
+class Source(ABC):
+    COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, path: str, chunk_size: int = 100000):
+        self.path: str = path
+        self.chunk_size: int = chunk_size
+
+    @staticmethod
+    def from_configuration(conf_dict: Dict, symbol: str = None):
+        source_type = conf_dict['type']
+        kwargs = {key.replace('-', '_'): value for key, value in conf_dict.items() if 'type' != key}
+        if 'cache' == source_type:
+            return CacheSource(symbol=symbol, **kwargs)
+        elif 'csv' == source_type:
+            return CSVSource(**kwargs)
+        elif 'parquet' == source_type:
+            return ParquetSource(**kwargs)
+        elif 'numpy' == source_type:
+            return NumpySource(**kwargs)
+        else:
+            raise ValueError("Source type {} is not supported.".format(source_type))
+
+    @staticmethod
+    def from_pairs_configuration(conf_dict: Dict) -> Dict[str, 'Source']:
+        return {pair_conf_dict['symbol']: Source.from_configuration(pair_conf_dict['source'], pair_conf_dict['symbol'])
+                for pair_conf_dict in conf_dict['market']['data']['pairs']}
+
+    @abstractmethod
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        raise NotImplemented()
+
+    def __len__(self) -> int:
+        raise TypeError("Length of {} is not known before reading it.".format(type(self).__name__))
+
+    def load(self) -> Dict[str, np.ndarray]:
+        chunks = list(self.chunks())
+        if 1 == len(chunks):
+            return chunks[0]
+        return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in self.COLUMNS}
+
+    def candles(self) -> Iterator[Candle]:
+        for chunk in self.chunks():
+            columns = [chunk[column].tolist() for column in self.COLUMNS]
+            for values in zip(*columns):
+                yield Candle(*values)
+
+
+class MemorySource(Source):
+    def __init__(self, ohlcv: Dict[str, np.ndarray], chunk_size: int = 100000):
+        super().__init__(None, chunk_size)
+        self.ohlcv: Dict[str, np.ndarray] = ohlcv
+
+    def __len__(self) -> int:
+        return len(self.ohlcv['timestamp'])
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        for start in range(0, len(self), self.chunk_size):
+            yield {column: self.ohlcv[column][start:start + self.chunk_size] for column in self.COLUMNS}
+
+    def load(self) -> Dict[str, np.ndarray]:
+        return self.ohlcv
+
+
+class CSVSource(Source):
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        with pd.read_csv(self.path, usecols=self.COLUMNS, chunksize=self.chunk_size) as reader:
+            for df in reader:
+                yield {column: df[column].to_numpy() for column in self.COLUMNS}
+
+
+class ParquetSource(Source):
+    def __parquet_file(self):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(self.path)
+
+    def __len__(self) -> int:
+        return self.__parquet_file().metadata.num_rows
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        for batch in self.__parquet_file().iter_batches(batch_size=self.chunk_size, columns=self.COLUMNS):
+            yield {column: batch.column(column).to_numpy() for column in self.COLUMNS}
+
+
+class NumpySource(Source):
+    def __array(self) -> np.ndarray:
+        return np.load(self.path, mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.__array())
+
+    def __columns(self, array: np.ndarray) -> Dict[str, np.ndarray]:
+        if array.dtype.names is not None:
+            return {column: array[column] for column in self.COLUMNS}
+        columns = {column: array[:, index] for index, column in enumerate(self.COLUMNS)}
+        columns['timestamp'] = columns['timestamp'].astype(np.int64)
+        return columns
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        array = self.__array()
+        for start in range(0, len(array), self.chunk_size):
+            yield self.__columns(array[start:start + self.chunk_size])
+
+    def load(self) -> Dict[str, np.ndarray]:
+        return self.__columns(self.__array())
+
+
+class CacheSource(Source):
+    def __init__(self, directory: str, symbol: str, time_frame: int, start: int = None, end: int = None,
+                 chunk_size: int = 100000):
+        super().__init__(directory, chunk_size)
+        self.cache: CandleCache = CandleCache(directory, symbol, time_frame)
+        self.start: int = start
+        self.end: int = end
+
+    def __len__(self) -> int:
+        return len(self.cache.read(self.start, self.end)['timestamp'])
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        ohlcv = self.cache.read(self.start, self.end)
+        for start in range(0, len(ohlcv['timestamp']), self.chunk_size):
+            yield {column: array[start:start + self.chunk_size] for column, array in ohlcv.items()}
+
+    def load(self) -> Dict[str, np.ndarray]:
+        return self.cache.read(self.start, self.end)
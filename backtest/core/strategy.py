@@ -3,9 +3,10 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple
 
 from backtest.core.data import Data
+from backtest.core.indicator import Indicator
 from backtest.core.trade import Trade
 from backtest.model.constant import TimeFrame
-from backtest.util.event import Event
+from backtest.util.event import EventBus
 
 
 class Strategy(ABC):
@@ -27,7 +28,7 @@ class Strategy(ABC):
         self.__time_frame: TimeFrame = None
         self.__trades_dict: Dict[Tuple[str, TimeFrame], Trade] = {}
 
-    def load_configuration(self, conf_dict: Dict, data: Data, events_dict: Dict[int, Event]):
+    def load_configuration(self, conf_dict: Dict, data: Data, event_bus: EventBus):
         self.__id: int = conf_dict['id']
         self.__name: str = conf_dict['name']
         self.__category: str = conf_dict['category']
@@ -38,17 +39,16 @@ class Strategy(ABC):
 
         self.__trades_dict: Dict[Tuple[str, TimeFrame], Trade] = {}
         for symbol, time_frame in itertools.product(self.__symbols, self.__time_frames):
-            self.__trades_dict[symbol, time_frame] = Trade(self.__data, self.__id, symbol, time_frame, events_dict)
+            self.__trades_dict[symbol, time_frame] = Trade(self.__data, self.__id, symbol, time_frame, event_bus)
 
-    def pre_next(self):
-        for symbol, time_frame in itertools.product(self.__symbols, self.__time_frames):
-            self.__symbol = symbol
-            self.__time_frame = time_frame
+    def dispatch(self, symbol: str, time_frame: TimeFrame):
+        self.__symbol = symbol
+        self.__time_frame = time_frame
+        self.__data.set_strategy_properties(symbol, time_frame, self.__ohlcv_dataframe_length)
+        self.next()
 
-            self.__trades_dict[(symbol, time_frame)].next()
-            if 0 == self.__data.timestamp % time_frame:
-                self.data.set_strategy_properties(self.__symbol, self.__time_frame, self.__ohlcv_dataframe_length)
-                self.next()
+    def get_indicator(self, indicator_class: type, **kwargs) -> Indicator:
+        return self.__data.get_indicator(self.__symbol, self.__time_frame, indicator_class, **kwargs)
 
     @abstractmethod
     def next(self):
@@ -66,6 +66,14 @@ class Strategy(ABC):
     def time_frames(self) -> List[TimeFrame]:
         return self.__time_frames
 
+    @property
+    def symbols(self) -> List[str]:
+        return self.__symbols
+
+    @property
+    def trades(self) -> List[Trade]:
+        return list(self.__trades_dict.values())
+
     @property
     def symbol(self) -> str:
         return self.__symbol
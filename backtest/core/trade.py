@@ -1,65 +1,84 @@
-from typing import Dict, List
+from typing import Dict
 
 from backtest.core.data import Data
-from backtest.model.constant import OrderSide, TimeFrame, OrderStatus, PositionSide, EventType
+from backtest.core.order_book import OrderBook
+from backtest.model.constant import OrderSide, TimeFrame, OrderStatus, PositionSide, EventType, FillResolution
 from backtest.model.order import Order
 from backtest.model.position import Position
-from backtest.util.event import Event
+from backtest.util.event import EventBus
 
 
 class Trade:
-    def __init__(self, data: Data, strategy_id: int, symbol: str, time_frame: int, events_dict: Dict[int, Event]):
+    def __init__(self, data: Data, strategy_id: int, symbol: str, time_frame: int, event_bus: EventBus):
         self.__data: Data = data
         self.__strategy_id: int = strategy_id
         self.__symbol: str = symbol
         self.__time_frame: int = time_frame
-        self.__event_dict: Dict[int, Event] = events_dict
+        self.__event_bus: EventBus = event_bus
 
-        self.__orders_dict: Dict[int, Order] = {}
+        self.__order_book: OrderBook = OrderBook()
         self.__position = Position(self.__strategy_id, self.__symbol, self.__time_frame)
         self.__position.price_precision = self.__data.get_price_precision(self.__symbol)
         self.__position.quantity_precision = self.__data.get_quantity_precision(self.__symbol)
 
+    def __getstate__(self) -> Dict:
+        # subscribers belong to the running process, the market attaches its own bus after a restore
+        state = self.__dict__.copy()
+        state['_Trade__event_bus'] = None
+        return state
+
+    @property
+    def event_bus(self) -> EventBus:
+        return self.__event_bus
+
+    @event_bus.setter
+    def event_bus(self, event_bus: EventBus):
+        self.__event_bus = event_bus
+
     def __handle_position(self, order: Order):
         if order.reduce_only:
-            self.__position.exit_orders.append(order)
+            self.__position.add_exit_order(order)
             if 100 == self.__position.exit_percentage:
-                on_new_closed_position = self.__event_dict[EventType.NEW_CLOSED_POSITION]
-                on_new_closed_position(position=self.__position)
+                if self.__event_bus.active[EventType.NEW_CLOSED_POSITION]:
+                    self.__event_bus.publish(EventType.NEW_CLOSED_POSITION, self.__position)
 
                 self.__position = Position(self.__strategy_id, self.__symbol, self.__time_frame)
                 self.__position.price_precision = self.__data.get_price_precision(self.__symbol)
                 self.__position.quantity_precision = self.__data.get_quantity_precision(self.__symbol)
         else:
-            self.__position.entry_orders.append(order)
+            self.__position.add_entry_order(order)
             if 1 == len(self.__position.entry_orders):
-                on_new_open_position = self.__event_dict[EventType.NEW_OPEN_POSITION]
-                on_new_open_position(position=self.__position)
+                if self.__event_bus.active[EventType.NEW_OPEN_POSITION]:
+                    self.__event_bus.publish(EventType.NEW_OPEN_POSITION, self.__position)
 
-    def __handle_order(self, order):
-        # stop orders
-        if order.stop_price and not order.is_activated and self.__data.is_price_touched(order.symbol, order.stop_price):
-            order.is_activated = True
+    def __handle_order(self, order: Order):
+        order.status = OrderStatus.FILLED
+        order.close_timestamp = self.__data.timestamp
+        order.filled_price = order.price if order.price else self.__data.get_market_price(order.symbol)
 
-        # limit and market and activated stop orders
-        if order.is_activated and (order.price is None or self.__data.is_price_touched(order.symbol, order.price)):
-            order.status = OrderStatus.FILLED
-            order.close_timestamp = self.__data.timestamp
-            order.filled_price = order.price if order.price else self.__data.get_market_price(order.symbol)
-            del self.__orders_dict[order.id]
+        if self.__event_bus.active[EventType.NEW_FILLED_ORDER]:
+            self.__event_bus.publish(EventType.NEW_FILLED_ORDER, order)
 
-            on_new_filled_order = self.__event_dict[EventType.NEW_FILLED_ORDER]
-            on_new_filled_order(order=order)
-
-            self.__handle_position(order)
+        self.__handle_position(order)
 
     def next(self):
-        for order in list(self.__orders_dict.values()):
-            self.__handle_order(order)
-
         last_candle = self.__data.get_last_candle(self.__symbol)
-        self.__position.maximum_met_price = max(self.__position.maximum_met_price, last_candle.high)
-        self.__position.minimum_met_price = min(self.__position.minimum_met_price, last_candle.low)
+        # symbols without a candle on this bar keep their orders untouched
+        if last_candle is None or last_candle.timestamp != self.__data.timestamp:
+            return
+        if 0 < len(self.__order_book):
+            path = self.__data.get_price_path(self.__symbol) \
+                if FillResolution.PATH == self.__data.fill_resolution else None
+            for order in self.__order_book.match(last_candle.low, last_candle.high, path):
+                # once the path decided which exit came first, exits beyond the open position are canceled
+                if path is not None and order.reduce_only and \
+                        round(self.__position.entry_percentage - self.__position.exit_percentage - order.percentage,
+                              8) < 0:
+                    self.__cancel(order)
+                else:
+                    self.__handle_order(order)
+
+        self.__position.update_met_prices(last_candle.high, last_candle.low)
 
     @property
     def symbol(self) -> str:
@@ -70,8 +89,8 @@ class Trade:
         return self.__time_frame
 
     @property
-    def open_orders(self) -> List[Order]:
-        return self.__orders_dict
+    def open_orders(self) -> Dict[int, Order]:
+        return self.__order_book.orders_dict
 
     def set_order(self, side: OrderSide, percentage: float, price: float = None, stop_price: float = None,
                   reduce_only: bool = None, comment: str = '') -> Order:
@@ -81,10 +100,10 @@ class Trade:
         order.time_frame = self.__time_frame
         order.status = OrderStatus.OPEN
         order.open_timestamp = self.__data.timestamp
-        self.__orders_dict[order.id] = order
+        self.__order_book.add(order)
 
-        on_new_open_order = self.__event_dict[EventType.NEW_OPEN_ORDER]
-        on_new_open_order(order=order)
+        if self.__event_bus.active[EventType.NEW_OPEN_ORDER]:
+            self.__event_bus.publish(EventType.NEW_OPEN_ORDER, order)
 
         return order
 
@@ -99,26 +118,26 @@ class Trade:
                               reduce_only=True, comment=comment)
 
     def get_order(self, order_id: int) -> Order:
-        if order_id in self.__orders_dict:
-            return self.__orders_dict[order_id]
+        if order_id in self.__order_book:
+            return self.__order_book[order_id]
         else:
             raise Exception('There is no open order with id {}'.format(order_id))
 
-    def cancel_order(self, order_id: int):
-        if order_id in self.__orders_dict:
-            order = self.__orders_dict[order_id]
-            order.status = OrderStatus.CANCELED
-            order.close_timestamp = self.__data.timestamp
-            del self.__orders_dict[order_id]
+    def __cancel(self, order: Order):
+        order.status = OrderStatus.CANCELED
+        order.close_timestamp = self.__data.timestamp
 
-            on_new_canceled_order = self.__event_dict[EventType.NEW_CANCELED_ORDER]
-            on_new_canceled_order(order=order)
+        if self.__event_bus.active[EventType.NEW_CANCELED_ORDER]:
+            self.__event_bus.publish(EventType.NEW_CANCELED_ORDER, order)
 
+    def cancel_order(self, order_id: int):
+        if order_id in self.__order_book:
+            self.__cancel(self.__order_book.remove(order_id))
         else:
             raise Exception('There is no open order with id {}'.format(order_id))
 
     def cancel_all_orders(self) -> bool:
-        for order_id in self.__orders_dict.keys():
+        for order_id in list(self.__order_book.orders_dict.keys()):
             self.cancel_order(order_id)
 
     @property
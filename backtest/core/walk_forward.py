@@ -0,0 +1,115 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.core.backtest import Backtest
+from backtest.core.optimizer import Optimizer, attach_ohlcv, get_shared_sources, run_backtest, share_ohlcv
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.core.source import Source
+from backtest.model.position import Position
+
+
+class WalkForward:
+    def __init__(self, conf_path: str, strategy_id: int, sources_dict: Dict[str, Source] = None,
+                 workers: int = None, batch_size: int = 50, objective: str = 'net_profit', **measures_kwargs):
+        self.__conf_path: str = conf_path
+        self.__strategy_id: int = strategy_id
+        self.__sources_dict: Dict[str, Source] = sources_dict
+        self.__workers: int = workers
+        self.__batch_size: int = batch_size
+        self.__objective: str = objective
+        self.__measures_kwargs: Dict = measures_kwargs if measures_kwargs else {'fix_equity': 1000}
+        self.__optimizer: Optimizer = Optimizer(conf_path, strategy_id, sources_dict, workers, batch_size,
+                                                **self.__measures_kwargs)
+        self.__conf_dict: Dict = self.__optimizer.conf_dict
+
+        # states
+        self.__positions: List[Position] = []
+
+    @staticmethod
+    def get_windows(start: int, end: int, in_sample: int, out_of_sample: int, anchored: bool = False) \
+            -> List[Tuple[int, int, int, int]]:
+        # (in-sample start, in-sample end, out-of-sample start, out-of-sample end), every range is [start, end)
+        windows = []
+        for index in itertools.count():
+            in_sample_start = start if anchored else start + index * out_of_sample
+            in_sample_end = start + in_sample + index * out_of_sample
+            if end <= in_sample_end:
+                break
+            windows.append((in_sample_start, in_sample_end, in_sample_end, min(in_sample_end + out_of_sample, end)))
+        return windows
+
+    def __select(self, inputs_list: List[Dict], summaries: List[Dict]) -> Tuple[Dict, float]:
+        scores = np.array([summary[self.__objective] for summary in summaries], dtype=np.float64)
+        scores[np.isnan(scores)] = -np.inf
+        index = int(np.argmax(scores))
+        return inputs_list[index], float(scores[index])
+
+    def run(self, inputs_list: List[Dict], in_sample: int, out_of_sample: int, anchored: bool = False,
+            warmup: int = 0) -> pd.DataFrame:
+        sources_dict = self.__sources_dict if self.__sources_dict is not None else \
+            Source.from_pairs_configuration(self.__conf_dict)
+        ohlcv_dict = {symbol: source.load() for symbol, source in sources_dict.items()}
+        time_frame = self.__conf_dict['market']['data']['time-frame']
+        start = min(int(ohlcv['timestamp'][0]) for ohlcv in ohlcv_dict.values())
+        end = max(int(ohlcv['timestamp'][-1]) for ohlcv in ohlcv_dict.values()) + time_frame
+        windows = self.get_windows(start, end, in_sample, out_of_sample, anchored)
+
+        # candles are shared once and every window reads a view of them
+        shared_memories, descriptors = share_ohlcv(ohlcv_dict)
+        workers = self.__workers if self.__workers is not None else os.cpu_count()
+        batch_size = max(min(self.__batch_size, math.ceil(len(inputs_list) * len(windows) / workers)), 1)
+        batches = [inputs_list[index:index + batch_size] for index in range(0, len(inputs_list), batch_size)]
+        try:
+            with ProcessPoolExecutor(workers, initializer=attach_ohlcv, initargs=(descriptors,)) as executor:
+                tasks = [(window, *self.__optimizer.get_conf_dict(batch)) for window in windows for batch in batches]
+                results = executor.map(run_backtest, itertools.repeat(self.__conf_path),
+                                       [conf_dict for _, conf_dict, _ in tasks],
+                                       [strategy_ids for _, _, strategy_ids in tasks],
+                                       itertools.repeat(self.__measures_kwargs),
+                                       [window[0] for window, _, _ in tasks], [window[1] for window, _, _ in tasks])
+                summaries = list(itertools.chain.from_iterable(results))
+                window_summaries = [summaries[index * len(inputs_list):(index + 1) * len(inputs_list)]
+                                    for index in range(len(windows))]
+
+                # the chosen inputs of every window are carried into its out-of-sample segment
+                selections = [self.__select(inputs_list, window_summary) for window_summary in window_summaries]
+                conf_dicts, strategy_ids_list = zip(*[self.__optimizer.get_conf_dict([inputs])
+                                                      for inputs, _ in selections])
+                positions_list = list(executor.map(run_out_of_sample, itertools.repeat(self.__conf_path),
+                                                   conf_dicts, [strategy_ids[0] for strategy_ids in strategy_ids_list],
+                                                   [window[2] for window in windows],
+                                                   [window[3] for window in windows], itertools.repeat(warmup)))
+        finally:
+            for memory in shared_memories:
+                memory.close()
+                memory.unlink()
+
+        self.__positions = list(itertools.chain.from_iterable(positions_list))
+        rows = []
+        for window, (inputs, score), positions in zip(windows, selections, positions_list):
+            summary = PerformanceMeasures(positions, **self.__measures_kwargs).summary()
+            rows.append({'in_sample_start': window[0], 'in_sample_end': window[1], 'out_of_sample_start': window[2],
+                         'out_of_sample_end': window[3], **inputs, 'in_sample_' + self.__objective: score,
+                         **{'out_of_sample_' + key: value for key, value in summary.items()}})
+        return pd.DataFrame(rows)
+
+    @property
+    def positions(self) -> List[Position]:
+        return self.__positions
+
+    def get_performance_measures(self, **kwargs) -> PerformanceMeasures:
+        return PerformanceMeasures(self.__positions, **(kwargs if kwargs else self.__measures_kwargs))
+
+
+def run_out_of_sample(conf_path: str, conf_dict: Dict, strategy_id: int, start: int, end: int, warmup: int) \
+        -> List[Position]:
+    # the warm-up bars only feed the strategy's history, positions entered before the window are left out
+    backtest = Backtest(conf_path, get_shared_sources(start - warmup, end), conf_dict)
+    backtest.run(preload=True, progress=False)
+    return [position for position in backtest.get_positions(strategy_id) if start <= position.entry_timestamp]
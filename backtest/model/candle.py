@@ -2,14 +2,22 @@ from datetime import datetime
 
 
 class Candle:
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume', '__datetime')
+
     def __init__(self, timestamp: int, open: float, high: float, low: float, close: float, volume: float):
         self.timestamp: int = timestamp
-        self.datetime: datetime = datetime.fromtimestamp(timestamp)
         self.open: float = open
         self.high: float = high
         self.low: float = low
         self.close: float = close
         self.volume: float = volume
+        self.__datetime: datetime = None
+
+    @property
+    def datetime(self) -> datetime:
+        if self.__datetime is None:
+            self.__datetime = datetime.fromtimestamp(self.timestamp)
+        return self.__datetime
 
     @property
     def to_list(self):
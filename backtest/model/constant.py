@@ -44,3 +44,25 @@ class EventType:
     NEW_CANCELED_ORDER = 2
     NEW_OPEN_POSITION = 3
     NEW_CLOSED_POSITION = 4
+
+
+class BackPressurePolicy:
+    BLOCK = 'BLOCK'
+    DROP_NEWEST = 'DROP_NEWEST'
+    DROP_OLDEST = 'DROP_OLDEST'
+
+
+class AlignmentPolicy:
+    FFILL = 'FFILL'
+    SKIP = 'SKIP'
+    FLAG = 'FLAG'
+
+
+class FillResolution:
+    ORDER = 'ORDER'
+    PATH = 'PATH'
+
+
+class ResamplingMethod:
+    BOOTSTRAP = 'BOOTSTRAP'
+    PERMUTATION = 'PERMUTATION'
@@ -6,6 +6,8 @@ from backtest.model.constant import OrderSide, TimeFrame, OrderStatus, OrderType
 
 class Order:
     __counter = itertools.count()
+    __slots__ = ('id', 'side', 'percentage', 'price', 'stop_price', 'reduce_only', 'comment', 'type', 'is_activated',
+                 'status', 'open_timestamp', 'close_timestamp', 'filled_price', 'strategy_id', 'symbol', 'time_frame')
 
     def __init__(self, side: OrderSide, percentage: float, price: float, stop_price: float,
                  reduce_only: bool, comment: str):
@@ -28,6 +30,17 @@ class Order:
         self.symbol: str = None
         self.time_frame: TimeFrame = None
 
+    @staticmethod
+    def get_next_id() -> int:
+        # the counter is restarted at the id it handed out, so reading it does not use up an order id
+        order_id = next(Order.__counter)
+        Order.__counter = itertools.count(order_id)
+        return order_id
+
+    @staticmethod
+    def set_next_id(order_id: int):
+        Order.__counter = itertools.count(order_id)
+
     def __str__(self) -> str:
         return "Order:" \
                "\n\t- {:<20}{}" \
@@ -9,6 +9,16 @@ from tabulate import tabulate
 
 
 class Position:
+    __slots__ = ('__id', '__strategy_id', '__symbol', '__time_frame',
+                 'maximum_met_price', 'minimum_met_price', 'entry_orders', 'exit_orders', 'price_precision',
+                 'quantity_precision',
+                 '__entry_orders_count', '__entry_percentage_sum', '__entry_weighted_sum', '__exit_orders_count',
+                 '__exit_percentage_sum', '__exit_weighted_sum',
+                 '__side', '__entry_timestamp', '__entry_datetime', '__entry_percentage', '__entry_price',
+                 '__exit_timestamp', '__exit_datetime', '__exit_price', '__profit_percentage', '__run_up_percentage',
+                 '__drawdown_percentage', '__bars',
+                 'equity', 'paid_fee', 'quantity', 'profit', 'run_up', 'drawdown')
+
     @staticmethod
     def from_kafka(position):
         instance = Position(position.strategy_id, position.symbol, position.time_frame, id=position.id)
@@ -32,6 +42,14 @@ class Position:
         self.price_precision: int = None
         self.quantity_precision: int = None
 
+        # running totals of the filled orders
+        self.__entry_orders_count: int = 0
+        self.__entry_percentage_sum: float = 0
+        self.__entry_weighted_sum: float = 0
+        self.__exit_orders_count: int = 0
+        self.__exit_percentage_sum: float = 0
+        self.__exit_weighted_sum: float = 0
+
         # private properties
         self.__side: OrderSide = None
         self.__entry_timestamp: int = None
@@ -59,11 +77,11 @@ class Position:
                        drawdown_percentage: float):
         self.__side: OrderSide = side
         self.__entry_timestamp: int = entry_timestamp
-        self.__entry_datetime: datetime = datetime.fromtimestamp(entry_timestamp)
+        self.__entry_datetime: datetime = None
         self.__entry_percentage: float = entry_percentage
         self.__entry_price: float = entry_price
         self.__exit_timestamp: int = exit_timestamp
-        self.__exit_datetime: datetime = datetime.fromtimestamp(exit_timestamp)
+        self.__exit_datetime: datetime = None
         self.__exit_price: float = exit_price
         self.__profit_percentage: float = profit_percentage
         self.__run_up_percentage: float = run_up_percentage
@@ -80,6 +98,39 @@ class Position:
         self.run_up = round(self.run_up_percentage / 100 * self.equity, 2)
         self.drawdown = round(self.drawdown_percentage / 100 * self.equity, 2)
 
+    def add_entry_order(self, order: Order):
+        self.__update_entry_totals()
+        self.entry_orders.append(order)
+        self.__entry_orders_count += 1
+        self.__entry_percentage_sum += order.percentage
+        self.__entry_weighted_sum += order.filled_price * order.percentage
+
+    def add_exit_order(self, order: Order):
+        self.__update_exit_totals()
+        self.exit_orders.append(order)
+        self.__exit_orders_count += 1
+        self.__exit_percentage_sum += order.percentage
+        self.__exit_weighted_sum += order.filled_price * order.percentage
+
+    def update_met_prices(self, high: float, low: float):
+        if self.maximum_met_price < high:
+            self.maximum_met_price = high
+        if low < self.minimum_met_price:
+            self.minimum_met_price = low
+
+    def __update_entry_totals(self):
+        # orders appended to the list directly are folded in on the next access
+        if self.__entry_orders_count != len(self.entry_orders):
+            self.__entry_orders_count = len(self.entry_orders)
+            self.__entry_percentage_sum = sum(order.percentage for order in self.entry_orders)
+            self.__entry_weighted_sum = sum(order.filled_price * order.percentage for order in self.entry_orders)
+
+    def __update_exit_totals(self):
+        if self.__exit_orders_count != len(self.exit_orders):
+            self.__exit_orders_count = len(self.exit_orders)
+            self.__exit_percentage_sum = sum(order.percentage for order in self.exit_orders)
+            self.__exit_weighted_sum = sum(order.filled_price * order.percentage for order in self.exit_orders)
+
     @property
     def id(self) -> int:
         return self.__id
@@ -110,22 +161,25 @@ class Position:
 
     @property
     def entry_datetime(self) -> datetime:
-        if self.__entry_datetime:
-            return self.__entry_datetime
-        return datetime.fromtimestamp(self.entry_timestamp)
+        if self.__entry_datetime is None and self.entry_timestamp is not None:
+            self.__entry_datetime = datetime.fromtimestamp(self.entry_timestamp)
+        return self.__entry_datetime
 
     @property
     def entry_percentage(self) -> float:
         if self.__entry_percentage:
             return self.__entry_percentage
-        return sum(order.percentage for order in self.entry_orders) if 0 < len(self.entry_orders) else 0
+        self.__update_entry_totals()
+        return self.__entry_percentage_sum
 
     @property
     def entry_price(self) -> float:
         if self.__entry_price:
             return self.__entry_price
-        weighted_sum = sum(order.filled_price * order.percentage for order in self.entry_orders)
-        return round(weighted_sum / self.entry_percentage, self.price_precision) if 0 < len(self.entry_orders) else None
+        self.__update_entry_totals()
+        if 0 == self.__entry_orders_count:
+            return None
+        return round(self.__entry_weighted_sum / self.entry_percentage, self.price_precision)
 
     @property
     def exit_timestamp(self) -> float:
@@ -135,20 +189,23 @@ class Position:
 
     @property
     def exit_datetime(self) -> datetime:
-        if self.__exit_datetime:
-            return self.__exit_datetime
-        return datetime.fromtimestamp(self.exit_timestamp)
+        if self.__exit_datetime is None and self.exit_timestamp is not None:
+            self.__exit_datetime = datetime.fromtimestamp(self.exit_timestamp)
+        return self.__exit_datetime
 
     @property
     def exit_percentage(self) -> int:
-        return sum(order.percentage for order in self.exit_orders) if len(self.exit_orders) else 0
+        self.__update_exit_totals()
+        return self.__exit_percentage_sum
 
     @property
     def exit_price(self) -> float:
         if self.__exit_price:
             return self.__exit_price
-        weighted_sum = sum(order.filled_price * order.percentage for order in self.exit_orders)
-        return round(weighted_sum / self.exit_percentage, self.price_precision) if 0 < len(self.exit_orders) else None
+        self.__update_exit_totals()
+        if 0 == self.__exit_orders_count:
+            return None
+        return round(self.__exit_weighted_sum / self.__exit_percentage_sum, self.price_precision)
 
     @property
     def profit_percentage(self) -> float:
@@ -172,7 +229,7 @@ class Position:
 
     @property
     def bars(self) -> int:
-        if self.__bars:
+        if self.__bars is None:
             self.__bars = int((self.exit_timestamp - self.entry_timestamp) / self.time_frame)
         return self.__bars
 
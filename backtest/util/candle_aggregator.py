@@ -0,0 +1,81 @@
+from typing import Tuple
+
+import numpy as np
+
+from backtest.model.candle import Candle
+from backtest.model.constant import TimeFrame
+from backtest.util.ohlcv_buffer import OHLCVBuffer
+
+
+class CandleAggregator:
+    def __init__(self, time_frame: TimeFrame, source_time_frame: TimeFrame):
+        self.__time_frame: TimeFrame = time_frame
+        self.__source_time_frame: TimeFrame = source_time_frame
+        self.__step: int = time_frame // source_time_frame
+
+        # states
+        self.__timestamp: int = None
+        self.__open: float = None
+        self.__high: float = None
+        self.__low: float = None
+        self.__close: float = None
+        self.__volume: float = None
+        self.__count: int = 0
+
+    def next(self, candle: Candle) -> Candle:
+        timestamp = candle.timestamp - candle.timestamp % self.__time_frame
+        if timestamp != self.__timestamp:
+            self.__timestamp = timestamp
+            self.__open = candle.open
+            self.__high = candle.high
+            self.__low = candle.low
+            self.__volume = candle.volume
+            self.__count = 1
+        else:
+            if self.__high < candle.high:
+                self.__high = candle.high
+            if candle.low < self.__low:
+                self.__low = candle.low
+            self.__volume += candle.volume
+            self.__count += 1
+        self.__close = candle.close
+
+        if 0 == (candle.timestamp + self.__source_time_frame) % self.__time_frame:
+            closed_candle = self.current_candle if self.__step == self.__count else None
+            self.__timestamp = None
+            self.__count = 0
+            return closed_candle
+        return None
+
+    @property
+    def current_candle(self) -> Candle:
+        if self.__timestamp is None:
+            return None
+        return Candle(self.__timestamp, self.__open, self.__high, self.__low, self.__close, self.__volume)
+
+    @property
+    def time_frame(self) -> TimeFrame:
+        return self.__time_frame
+
+
+def resample(source: OHLCVBuffer, time_frame: TimeFrame, source_time_frame: TimeFrame) \
+        -> Tuple[OHLCVBuffer, np.ndarray]:
+    arrays = source.get_arrays()
+    timestamps = arrays['timestamp']
+    if 0 == len(timestamps):
+        return OHLCVBuffer(), np.empty(0, dtype=np.int64)
+
+    buckets = timestamps - timestamps % time_frame
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)]
+
+    # only buckets holding every source candle are kept, same as CandleAggregator
+    complete = (ends - starts) == time_frame // source_time_frame
+    high = np.maximum.reduceat(arrays['high'], starts)[complete]
+    low = np.minimum.reduceat(arrays['low'], starts)[complete]
+    volume = np.add.reduceat(arrays['volume'], starts)[complete]
+    starts, ends = starts[complete], ends[complete]
+
+    buffer = OHLCVBuffer.from_arrays(buckets[starts], arrays['open'][starts], high, low, arrays['close'][ends - 1],
+                                     volume)
+    return buffer, ends - 1
@@ -1,15 +1,70 @@
-class Event:
-    def __init__(self):
-        self.__event_handlers = []
+from typing import Callable, Dict, List, Tuple
+
+
+class EventBus:
+    def __init__(self, event_types: List[int]):
+        # `active` is read on the hot path so that publishing costs nothing while nobody listens
+        self.active: Dict[int, bool] = {event_type: False for event_type in event_types}
+        self.__subscriptions_dict: Dict[int, Tuple[Tuple[Callable, int, str], ...]] = \
+            {event_type: () for event_type in event_types}
+        self.__batched_subscriptions_dict: Dict[int, Tuple[Tuple[Callable, int, str], ...]] = \
+            {event_type: () for event_type in event_types}
+        self.__batches_dict: Dict[int, List] = {event_type: [] for event_type in event_types}
+
+    def __update_active(self, event_type: int):
+        self.active[event_type] = 0 < len(self.__subscriptions_dict[event_type]) + \
+                                  len(self.__batched_subscriptions_dict[event_type])
+
+    def subscribe(self, event_type: int, handler: Callable, strategy_id: int = None, symbol: str = None,
+                  batched: bool = False) -> Callable:
+        subscriptions_dict = self.__batched_subscriptions_dict if batched else self.__subscriptions_dict
+        subscriptions_dict[event_type] = subscriptions_dict[event_type] + ((handler, strategy_id, symbol),)
+        self.__update_active(event_type)
+        return handler
+
+    def unsubscribe(self, event_type: int, handler: Callable):
+        for subscriptions_dict in [self.__subscriptions_dict, self.__batched_subscriptions_dict]:
+            subscriptions_dict[event_type] = tuple(subscription for subscription in subscriptions_dict[event_type]
+                                                   if subscription[0] != handler)
+        self.__update_active(event_type)
+
+    def publish(self, event_type: int, item):
+        for handler, strategy_id, symbol in self.__subscriptions_dict[event_type]:
+            if (strategy_id is None or strategy_id == item.strategy_id) and (symbol is None or symbol == item.symbol):
+                handler(item)
+        if self.__batched_subscriptions_dict[event_type]:
+            self.__batches_dict[event_type].append(item)
+
+    def flush(self):
+        for event_type, items in self.__batches_dict.items():
+            if not items:
+                continue
+            self.__batches_dict[event_type] = []
+            for handler, strategy_id, symbol in self.__batched_subscriptions_dict[event_type]:
+                selected_items = [item for item in items
+                                  if (strategy_id is None or strategy_id == item.strategy_id)
+                                  and (symbol is None or symbol == item.symbol)]
+                if selected_items:
+                    handler(selected_items)
+
+
+class BoundEvent:
+    def __init__(self, event_bus: EventBus, event_type: int, keyword: str):
+        self.__event_bus: EventBus = event_bus
+        self.__event_type: int = event_type
+        self.__keyword: str = keyword
+        self.__wrappers_dict: Dict[Callable, Callable] = {}
 
     def add_handler(self, handler):
-        self.__event_handlers.append(handler)
+        keyword = self.__keyword
+        wrapper = self.__event_bus.subscribe(self.__event_type, lambda item: handler(**{keyword: item}))
+        self.__wrappers_dict[handler] = wrapper
         return self
 
     def remove_handler(self, handler):
-        self.__event_handlers.remove(handler)
+        self.__event_bus.unsubscribe(self.__event_type, self.__wrappers_dict.pop(handler))
         return self
 
-    def __call__(self, *args, **kwargs):
-        for event_handler in self.__event_handlers:
-            event_handler(*args, **kwargs)
+    def __call__(self, item=None, **kwargs):
+        # the old events were called with their keyword, for example on_new_filled_order(order=order)
+        self.__event_bus.publish(self.__event_type, kwargs[self.__keyword] if item is None else item)
@@ -0,0 +1,136 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+
+class OHLCVBuffer:
+    COLUMNS = ['timestamp', 'datetime', 'open', 'high', 'low', 'close', 'volume']
+    PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, capacity: int = None, initial_size: int = 1024):
+        # a bounded buffer keeps twice its capacity so that the latest `capacity` rows are always contiguous
+        self.__capacity: int = capacity
+        size = 2 * capacity if capacity is not None else initial_size
+
+        self.__timestamps: np.ndarray = np.empty(size, dtype=np.int64)
+        self.__values: np.ndarray = np.empty((len(self.PRICE_COLUMNS), size), dtype=np.float64)
+
+        # states
+        self.__offset: int = 0  # number of rows dropped from the head of the storage
+        self.__length: int = 0  # number of rows currently held in the storage
+
+    @staticmethod
+    def from_arrays(timestamps: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    volume: np.ndarray):
+        instance = OHLCVBuffer(initial_size=max(len(timestamps), 1))
+        instance.extend(timestamps, open, high, low, close, volume)
+        return instance
+
+    @staticmethod
+    def from_ohlcv(ohlcv):
+        if isinstance(ohlcv, OHLCVBuffer):
+            return ohlcv
+        if isinstance(ohlcv, pd.DataFrame):
+            columns = [ohlcv[column].to_numpy() for column in ['timestamp', *OHLCVBuffer.PRICE_COLUMNS]]
+        elif isinstance(ohlcv, dict):
+            columns = [np.asarray(ohlcv[column]) for column in ['timestamp', *OHLCVBuffer.PRICE_COLUMNS]]
+        elif ohlcv.dtype.names is not None:
+            columns = [ohlcv[column] for column in ['timestamp', *OHLCVBuffer.PRICE_COLUMNS]]
+        else:
+            columns = [ohlcv[:, index] for index in range(len(OHLCVBuffer.PRICE_COLUMNS) + 1)]
+        return OHLCVBuffer.from_arrays(*columns)
+
+    def __len__(self) -> int:
+        return self.__offset + self.__length
+
+    def __reserve(self, count: int):
+        size = len(self.__timestamps)
+        if self.__length + count <= size:
+            return
+
+        if self.__capacity is None:
+            new_size = max(2 * size, self.__length + count)
+            timestamps = np.empty(new_size, dtype=np.int64)
+            values = np.empty((len(self.PRICE_COLUMNS), new_size), dtype=np.float64)
+            timestamps[:self.__length] = self.__timestamps[:self.__length]
+            values[:, :self.__length] = self.__values[:, :self.__length]
+            self.__timestamps, self.__values = timestamps, values
+        else:
+            # compacted into new arrays, views handed out on earlier bars keep their data
+            keep = min(self.__length, max(self.__capacity - count, 0))
+            drop = self.__length - keep
+            timestamps = np.empty(size, dtype=np.int64)
+            values = np.empty((len(self.PRICE_COLUMNS), size), dtype=np.float64)
+            timestamps[:keep] = self.__timestamps[drop:self.__length]
+            values[:, :keep] = self.__values[:, drop:self.__length]
+            self.__timestamps, self.__values = timestamps, values
+            self.__offset += drop
+            self.__length = keep
+
+    def append(self, timestamp: int, open: float, high: float, low: float, close: float, volume: float):
+        if self.__length == len(self.__timestamps):
+            self.__reserve(1)
+
+        index = self.__length
+        self.__timestamps[index] = timestamp
+        values = self.__values
+        values[0, index] = open
+        values[1, index] = high
+        values[2, index] = low
+        values[3, index] = close
+        values[4, index] = volume
+        self.__length += 1
+
+    def extend(self, timestamps: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               volume: np.ndarray):
+        count = len(timestamps)
+        if self.__capacity is not None and self.__capacity < count:
+            self.__offset += count - self.__capacity
+            timestamps, open, high, low, close, volume = \
+                [column[-self.__capacity:] for column in (timestamps, open, high, low, close, volume)]
+            count = self.__capacity
+
+        self.__reserve(count)
+        start, end = self.__length, self.__length + count
+        self.__timestamps[start:end] = timestamps
+        for row, column in enumerate((open, high, low, close, volume)):
+            self.__values[row, start:end] = column
+        self.__length = end
+
+    def __bounds(self, limit: int = None, end: int = None):
+        end = len(self) if end is None else min(end, len(self))
+        start = self.__offset if limit is None else max(end - limit, self.__offset)
+        return start, max(start, end)
+
+    def get_arrays(self, limit: int = None, end: int = None) -> Dict[str, np.ndarray]:
+        start, end = self.__bounds(limit, end)
+        start, end = start - self.__offset, end - self.__offset
+        arrays = {'timestamp': self.__timestamps[start:end]}
+        for row, column in enumerate(self.PRICE_COLUMNS):
+            arrays[column] = self.__values[row, start:end]
+        for array in arrays.values():
+            array.flags.writeable = False
+        return arrays
+
+    def get_dataframe(self, limit: int = None, end: int = None) -> pd.DataFrame:
+        start, end = self.__bounds(limit, end)
+        arrays = self.get_arrays(limit, end)
+        datetimes = pd.to_datetime(arrays['timestamp'], unit='s', utc=True).tz_convert(tzlocal()).tz_localize(None)
+        columns = {'timestamp': arrays['timestamp'], 'datetime': datetimes}
+        for column in self.PRICE_COLUMNS:
+            columns[column] = arrays[column]
+        return pd.DataFrame(columns, columns=self.COLUMNS, index=pd.RangeIndex(start, end), copy=False)
+
+    def get_row(self, index: int = -1):
+        position = (self.__length + index) if index < 0 else (index - self.__offset)
+        return (int(self.__timestamps[position]), *self.__values[:, position].tolist())
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.get_arrays()['timestamp']
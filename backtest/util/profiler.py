@@ -0,0 +1,79 @@
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from tabulate import tabulate
+
+
+class Profiler:
+    def __init__(self, per_bar: bool = False):
+        self.__per_bar: bool = per_bar
+
+        # stage paths are tuples of nested stage names, e.g. ('bar', 'strategy 1 BTCUSDT 3600', 'data.ohlcv_dataframe')
+        self.__totals_dict: Dict[Tuple[str, ...], float] = {}
+        self.__self_totals_dict: Dict[Tuple[str, ...], float] = {}
+        self.__counts_dict: Dict[Tuple[str, ...], int] = {}
+
+        # states
+        self.__path: Tuple[str, ...] = ()
+        self.__frames: List[List] = []
+        self.__bar_timestamps: List[int] = []
+        self.__bar_timings: List[Dict[str, float]] = []
+        self.__bar_timings_dict: Dict[str, float] = None
+
+    def start(self, stage: str):
+        self.__path = self.__path + (stage,)
+        self.__frames.append([time.perf_counter(), 0.0])
+
+    def stop(self):
+        started, children = self.__frames.pop()
+        elapsed = time.perf_counter() - started
+        path = self.__path
+        self.__totals_dict[path] = self.__totals_dict.get(path, 0.0) + elapsed
+        self.__self_totals_dict[path] = self.__self_totals_dict.get(path, 0.0) + elapsed - children
+        self.__counts_dict[path] = self.__counts_dict.get(path, 0) + 1
+        if self.__frames:
+            self.__frames[-1][1] += elapsed
+        if self.__bar_timings_dict is not None and 2 == len(path):
+            self.__bar_timings_dict[path[1]] = self.__bar_timings_dict.get(path[1], 0.0) + elapsed
+        self.__path = path[:-1]
+
+    def start_bar(self):
+        if self.__per_bar:
+            self.__bar_timings_dict = {}
+        self.start('bar')
+
+    def stop_bar(self, timestamp: int):
+        self.stop()
+        if self.__per_bar:
+            self.__bar_timestamps.append(timestamp)
+            self.__bar_timings.append(self.__bar_timings_dict)
+
+    @property
+    def total(self) -> float:
+        return sum(total for path, total in self.__totals_dict.items() if 1 == len(path))
+
+    def summary(self) -> pd.DataFrame:
+        total = self.total
+        rows = [{'stage': ';'.join(path), 'calls': self.__counts_dict[path], 'total': self.__totals_dict[path],
+                 'self': self.__self_totals_dict[path], 'mean': self.__totals_dict[path] / self.__counts_dict[path],
+                 'percentage': self.__totals_dict[path] / total * 100 if total else 0}
+                for path in sorted(self.__totals_dict)]
+        return pd.DataFrame(rows, columns=['stage', 'calls', 'total', 'self', 'mean', 'percentage'])
+
+    def get_bar_timings(self) -> pd.DataFrame:
+        return pd.DataFrame(self.__bar_timings, index=pd.Index(self.__bar_timestamps, name='timestamp')).fillna(0)
+
+    def tabulate(self):
+        values = [['  ' * row.stage.count(';') + row.stage.split(';')[-1], row.calls, round(row.total, 4),
+                   round(row.self, 4), round(row.mean * 1e6, 2), round(row.percentage, 2)]
+                  for row in self.summary().itertuples()]
+        headers = ["Stage", "Calls", "Total (s)", "Self (s)", "Mean (us)", "Percentage"]
+        table = tabulate(values, headers=headers, tablefmt="pretty", colalign=("left",))
+        print(table)
+
+    def dump_collapsed(self, path: str):
+        # collapsed stacks with self time in microseconds, the input format of flamegraph.pl and speedscope
+        with open(path, 'w') as trace_file:
+            for stage_path, self_total in sorted(self.__self_totals_dict.items()):
+                trace_file.write("{} {}\n".format(';'.join(stage_path), int(round(self_total * 1e6))))
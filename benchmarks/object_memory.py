@@ -0,0 +1,48 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+from backtest.model.candle import Candle
+from backtest.model.order import Order
+from backtest.model.position import Position
+
+
+def create_candle(index: int) -> Candle:
+    return Candle(1600000000 + 60 * index, 100.0, 101.0, 99.0, 100.5, 10.0)
+
+
+def create_order(index: int) -> Order:
+    return Order(1, 100, 100.0, None, False, '')
+
+
+def create_position(index: int) -> Position:
+    return Position(1, 'BTCUSDT', 60, id=index)
+
+
+def measure(factory, count: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [factory(index) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and construction time of the model objects.")
+    parser.add_argument('--count', type=int, default=1000000, help="number of objects created per model")
+    args = parser.parse_args()
+
+    print("{:<10}{:>20}{:>20}".format("Model", "MB per million", "Seconds per million"))
+    for name, factory in [('Candle', create_candle), ('Order', create_order), ('Position', create_position)]:
+        memory, elapsed = measure(factory, args.count)
+        scale = 1000000 / args.count
+        print("{:<10}{:>20.1f}{:>20.2f}".format(name, memory * scale / 2 ** 20, elapsed * scale))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import os
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+STRATEGIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategies')
+
+
+def create_ohlcv(seed: int, length: int = 1500, start: int = 1600002000, time_frame: int = 60) \
+        -> Dict[str, np.ndarray]:
+    generator = np.random.default_rng(seed)
+    close = np.round(100 * np.exp(np.cumsum(generator.normal(0, 0.002, length))), 2)
+    open = np.r_[100.0, close[:-1]]
+    high = np.round(np.maximum(open, close) * (1 + np.abs(generator.normal(0, 0.001, length))), 2)
+    low = np.round(np.minimum(open, close) * (1 - np.abs(generator.normal(0, 0.001, length))), 2)
+    volume = np.round(generator.random(length) * 10, 3)
+    timestamp = start + time_frame * np.arange(length, dtype=np.int64)
+    return {'timestamp': timestamp, 'open': open, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+
+def create_conf_dict(file_path: str, inputs: Dict, symbols: List[str] = None, time_frames: List[int] = None,
+                     **data_conf_dict) -> Dict:
+    symbols = symbols if symbols is not None else ['AAA']
+    time_frames = time_frames if time_frames is not None else [60]
+    pairs = [{'symbol': symbol, 'price-precision': 2, 'quantity-precision': 3} for symbol in symbols]
+    return {
+        'market': {'data': {'time-frame': 60, 'time-frames': time_frames, 'pairs': pairs, **data_conf_dict}},
+        'strategy': {'module-dir': STRATEGIES_DIR,
+                     'files': [{'file-path': file_path, 'id': 1, 'name': 'test', 'category': 'test',
+                                'symbols': symbols, 'time-frames': time_frames, 'inputs': inputs}]},
+    }
+
+
+@pytest.fixture
+def ohlcv_factory():
+    return create_ohlcv
+
+
+@pytest.fixture
+def conf_dict_factory():
+    return create_conf_dict
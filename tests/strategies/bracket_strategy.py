@@ -0,0 +1,22 @@
+from backtest.core.strategy import Strategy
+from backtest.model.constant import PositionSide
+
+
+class BracketStrategy(Strategy):
+    def __init__(self, width):
+        super().__init__(1)
+        self.width = width
+
+    def next(self):
+        trade = self.trade
+        side = PositionSide.LONG if 0 == self.data.timestamp // 60 % 2 else PositionSide.SHORT
+        if trade.position.side is None:
+            # an exit left over from the closed position is dropped before the next entry
+            if trade.open_orders:
+                trade.cancel_all_orders()
+            trade.entry(side, 100)
+        elif trade.position.entry_price is not None and not trade.open_orders:
+            price = trade.position.entry_price
+            side = trade.position.side
+            trade.exit(100, price=round(price * (1 + side * self.width), 2))
+            trade.exit(100, stop_price=round(price * (1 - side * self.width), 2))
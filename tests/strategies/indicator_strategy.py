@@ -0,0 +1,18 @@
+from backtest.core.indicator import ATR, EMA, RSI, SMA, BollingerBands
+from backtest.core.strategy import Strategy
+
+
+class IndicatorStrategy(Strategy):
+    def __init__(self, records):
+        super().__init__(1)
+        self.records = records
+
+    def next(self):
+        indicators = [self.get_indicator(SMA, period=10), self.get_indicator(EMA, period=10),
+                      self.get_indicator(RSI, period=14), self.get_indicator(ATR, period=14),
+                      self.get_indicator(BollingerBands, period=20, deviations=2)]
+        timestamps = self.data.ohlcv_arrays['timestamp']
+        if 0 == len(timestamps):
+            return
+        timestamp = int(timestamps[-1])
+        self.records.append((self.symbol, self.time_frame, timestamp, [indicator.value for indicator in indicators]))
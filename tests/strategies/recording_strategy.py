@@ -0,0 +1,10 @@
+from backtest.core.strategy import Strategy
+
+
+class RecordingStrategy(Strategy):
+    def __init__(self, records):
+        super().__init__(1)
+        self.records = records
+
+    def next(self):
+        self.records.append((self.data.timestamp, self.id, self.symbol, self.time_frame))
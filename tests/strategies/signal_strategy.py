@@ -0,0 +1,35 @@
+import numpy as np
+
+from backtest.core.strategy import Strategy
+
+
+class SignalStrategy(Strategy):
+    def __init__(self, timestamps, entries, exits, stop_loss, take_profit, side):
+        super().__init__(1)
+        self.indices_dict = {int(timestamp): index for index, timestamp in enumerate(timestamps)}
+        self.entries, self.exits = entries, exits
+        self.stop_loss, self.take_profit = stop_loss, take_profit
+        self.side = side
+        self.is_protected = False
+
+    def next(self):
+        index = self.indices_dict[int(self.data.ohlcv_arrays['timestamp'][-1])]
+        trade = self.trade
+        if trade.position.side is None:
+            if trade.open_orders and all(order.reduce_only for order in trade.open_orders.values()):
+                trade.cancel_all_orders()
+            self.is_protected = False
+            if not trade.open_orders and self.entries[index]:
+                trade.entry(self.side, 100)
+            return
+
+        if not self.is_protected:
+            self.is_protected = True
+            if not np.isnan(self.stop_loss[index]):
+                trade.exit(100, stop_price=float(self.stop_loss[index]))
+            if not np.isnan(self.take_profit[index]):
+                trade.exit(100, price=float(self.take_profit[index]))
+        if self.exits[index] and not any(order.price is None and order.stop_price is None
+                                         for order in trade.open_orders.values()):
+            trade.cancel_all_orders()
+            trade.exit(100)
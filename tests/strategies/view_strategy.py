@@ -0,0 +1,16 @@
+from backtest.core.strategy import Strategy
+
+
+class ViewStrategy(Strategy):
+    def __init__(self, records):
+        super().__init__(5)
+        self.records = records
+
+    def next(self):
+        df, arrays = self.data.ohlcv_dataframe, self.data.ohlcv_arrays
+        self.records.append((self.id, self.data.timestamp, 'mine' in df, 'mine' in arrays, df.close.tolist(),
+                             arrays['close'].tolist()))
+        # readers may add their own columns and keys without the next reader seeing them
+        df['mine'] = df.close
+        arrays['mine'] = arrays['close']
+        assert not arrays['close'].flags.writeable
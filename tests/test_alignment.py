@@ -0,0 +1,44 @@
+from backtest.core.alignment import CandleAligner
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource
+from backtest.model.candle import Candle
+from backtest.model.constant import AlignmentPolicy
+
+
+def create_candles(indices):
+    return [Candle(60 * index, 100 + index, 101 + index, 99 + index, 100.5 + index, 1) for index in indices]
+
+
+def test_fill_limit_is_applied_per_symbol_to_consecutive_fills():
+    aligner = CandleAligner(['AAA', 'BBB'], 60, AlignmentPolicy.FFILL, fill_limit=2)
+    aligned_dicts = list(aligner.align({'AAA': create_candles(range(10)),
+                                        'BBB': create_candles([0, 1, 2, 4, 5, 6])}))
+
+    assert [sorted(aligned_dict) for aligned_dict in aligned_dicts] == \
+           [['AAA', 'BBB']] * 9 + [['AAA']]
+    # a real candle resets the count, so BBB is filled again after its data ends
+    assert [aligned_dict['BBB'].volume for aligned_dict in aligned_dicts[:9]] == [1, 1, 1, 0, 1, 1, 1, 0, 0]
+    assert aligned_dicts[8]['BBB'].close == 106.5
+    assert aligner.gaps == [(540, 'BBB')]
+    assert 3 == aligner.filled_candles
+
+
+def test_fill_limit_is_applied_to_whole_market_gaps():
+    aligner = CandleAligner(['AAA', 'BBB'], 60, AlignmentPolicy.FFILL, fill_limit=1)
+    aligned_dicts = list(aligner.align({'AAA': create_candles([0, 1, 5]), 'BBB': create_candles([0, 1, 5])}))
+
+    assert [aligned_dict['AAA'].timestamp for aligned_dict in aligned_dicts] == [0, 60, 120, 300]
+    assert aligner.gaps == [(180, 'AAA'), (180, 'BBB'), (240, 'AAA'), (240, 'BBB')]
+
+
+def test_streaming_runner_reads_fill_limit_from_configuration(ohlcv_factory, conf_dict_factory):
+    conf_dict = conf_dict_factory('recording_strategy.py', {'records': []}, symbols=['AAA', 'BBB'],
+                                  **{'alignment': AlignmentPolicy.FFILL, 'fill-limit': 2})
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=20), 'BBB': ohlcv_factory(2, length=15)}
+    backtest = Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict)
+    backtest.run(progress=False)
+
+    timestamps = ohlcv_dict['AAA']['timestamp'].tolist()
+    assert 2 == backtest.aligner.filled_candles
+    assert backtest.aligner.gaps == [(timestamp, 'BBB') for timestamp in timestamps[17:]]
+    assert timestamps[16] == backtest.market.data.get_last_candle('BBB').timestamp
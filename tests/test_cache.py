@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from backtest.core.cache import CandleCache
+from backtest.core.source import Source
+
+
+def test_cache_reads_back_what_was_written(ohlcv_factory, tmp_path):
+    ohlcv = ohlcv_factory(1)
+    cache = CandleCache(str(tmp_path), 'AAA', 60)
+    cache.write(ohlcv)
+
+    assert cache.exists
+    assert cache.metadata == {'symbol': 'AAA', 'time-frame': 60, 'count': 1500,
+                              'first-timestamp': int(ohlcv['timestamp'][0]),
+                              'last-timestamp': int(ohlcv['timestamp'][-1])}
+    ohlcv_read = cache.read()
+    for column, array in ohlcv.items():
+        assert ohlcv_read[column].tolist() == array.tolist()
+
+
+def test_seek_and_read_select_the_half_open_range(ohlcv_factory, tmp_path):
+    ohlcv = ohlcv_factory(1)
+    cache = CandleCache(str(tmp_path), 'AAA', 60)
+    cache.write(ohlcv)
+    timestamps = ohlcv['timestamp']
+
+    assert 0 == cache.seek(0)
+    assert 10 == cache.seek(int(timestamps[10]))
+    assert 11 == cache.seek(int(timestamps[10]) + 1)
+    assert 1500 == cache.seek(int(timestamps[-1]) + 60)
+
+    ohlcv_read = cache.read(int(timestamps[10]), int(timestamps[20]))
+    assert ohlcv_read['timestamp'].tolist() == timestamps[10:20].tolist()
+    assert ohlcv_read['close'].tolist() == ohlcv['close'][10:20].tolist()
+
+    source = Source.from_configuration({'type': 'cache', 'directory': str(tmp_path), 'time-frame': 60,
+                                        'start': int(timestamps[100]), 'end': int(timestamps[300])}, 'AAA')
+    assert 200 == len(source)
+    assert [candle.timestamp for candle in source.candles()] == timestamps[100:300].tolist()
+
+
+@pytest.mark.parametrize('timestamps', [[60, 120, 150], [60, 180, 120]])
+def test_cache_rejects_timestamps_off_the_grid_or_out_of_order(tmp_path, timestamps):
+    ohlcv = {column: np.ones(3) for column in CandleCache.DTYPE.names}
+    ohlcv['timestamp'] = np.array(timestamps)
+    with pytest.raises(Exception):
+        CandleCache(str(tmp_path), 'AAA', 60).write(ohlcv)
@@ -0,0 +1,18 @@
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource
+
+
+def test_shared_views_do_not_leak_between_readers(ohlcv_factory, conf_dict_factory):
+    records = []
+    conf_dict = conf_dict_factory('view_strategy.py', {'records': records})
+    conf_dict['strategy']['files'][0]['variants'] = [{'id': 1}, {'id': 2}]
+    ohlcv = ohlcv_factory(1, length=50)
+    Backtest(None, {'AAA': MemorySource(ohlcv)}, conf_dict).run(preload=True, progress=False)
+
+    timestamps = ohlcv['timestamp'].tolist()
+    assert [record[:2] for record in records] == [(strategy_id, timestamp) for timestamp in timestamps
+                                                  for strategy_id in [1, 2]]
+    for strategy_id, timestamp, has_column, has_key, closes, array_closes in records:
+        index = timestamps.index(timestamp)
+        assert not has_column and not has_key
+        assert closes == array_closes == ohlcv['close'][max(index - 4, 0):index + 1].tolist()
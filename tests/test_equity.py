@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from backtest.core.market import Market
+from backtest.model.candle import Candle
+from backtest.model.constant import EventType, FillResolution
+
+
+def create_market(conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                  time_frames=[60, 300], **{'fill-resolution': FillResolution.PATH})
+    return Market(None, conf_dict), conf_dict['strategy']['files'][0]
+
+
+def get_candles_dicts(ohlcv_dict):
+    for index in range(len(ohlcv_dict['AAA']['timestamp'])):
+        yield {symbol: Candle(*(ohlcv[column][index] for column in ['timestamp', 'open', 'high', 'low', 'close',
+                                                                     'volume']))
+               for symbol, ohlcv in ohlcv_dict.items()}
+
+
+def test_equity_curve_follows_every_position(ohlcv_factory, conf_dict_factory):
+    market, strategy_dict = create_market(conf_dict_factory)
+    market.add_strategy({**strategy_dict, 'id': 2, 'inputs': {'width': 0.008}})
+    equity_curve = market.enable_equity_curve(initial_capital=500, fix_equity=1000)
+    closed_positions = []
+    market.event_bus.subscribe(EventType.NEW_CLOSED_POSITION, closed_positions.append)
+
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=400), 'BBB': ohlcv_factory(2, length=400)}
+    expected, exposures = [], []
+    for candles_dict in get_candles_dicts(ohlcv_dict):
+        market.next(candles_dict)
+        row = []
+        for strategy in market.strategies:
+            # the curve reuses each position's profit instead of scanning them on every bar
+            profit = sum(position.profit_percentage / 100 * 1000 for position in closed_positions
+                         if strategy.id == position.strategy_id and position.entry_price is not None)
+            profit += sum(equity_curve.get_profit(trade.position, candles_dict[trade.symbol].close)[0]
+                          for trade in strategy.trades)
+            row.append(500 + profit)
+        expected.append(row)
+        exposures.append(sum(equity_curve.get_profit(trade.position, candles_dict[trade.symbol].close)[1]
+                             for strategy in market.strategies for trade in strategy.trades))
+
+    expected = np.array(expected)
+    assert 10 < len(closed_positions)
+    np.testing.assert_allclose(equity_curve.get_equity(1), expected[:, 0], atol=1e-9)
+    np.testing.assert_allclose(equity_curve.get_equity(2), expected[:, 1], atol=1e-9)
+    np.testing.assert_allclose(equity_curve.get_equity(), expected.sum(axis=1) - 500, atol=1e-9)
+    np.testing.assert_allclose(equity_curve.get_exposure(), exposures, atol=1e-9)
+    assert (0 != equity_curve.get_exposure()).any()
+    assert equity_curve.timestamps.tolist() == ohlcv_dict['AAA']['timestamp'].tolist()
+
+
+def test_strategies_added_after_enabling_start_flat(ohlcv_factory, conf_dict_factory):
+    market, strategy_dict = create_market(conf_dict_factory)
+    equity_curve = market.enable_equity_curve()
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=300), 'BBB': ohlcv_factory(2, length=300)}
+    for index, candles_dict in enumerate(get_candles_dicts(ohlcv_dict)):
+        if 100 == index:
+            market.add_strategy({**strategy_dict, 'id': 2})
+        market.next(candles_dict)
+
+    equity = equity_curve.get_equity(2)
+    assert 300 == len(equity) == len(equity_curve.get_equity(1))
+    assert (1000 == equity[:100]).all() and (0 == equity_curve.get_exposure(2)[:100]).all()
+    assert (1000 != equity[100:]).any()
+    np.testing.assert_allclose(equity_curve.get_equity(), equity_curve.get_equity(1) + equity - 1000, atol=1e-9)
+    with pytest.raises(KeyError):
+        equity_curve.get_equity(3)
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from backtest.util.event import BoundEvent, EventBus
+
+
+def create_item(strategy_id: int, symbol: str):
+    return SimpleNamespace(strategy_id=strategy_id, symbol=symbol)
+
+
+def test_handlers_only_receive_the_items_they_filter_for():
+    event_bus = EventBus([0, 1])
+    all_items, strategy_items, symbol_items = [], [], []
+    event_bus.subscribe(0, all_items.append)
+    event_bus.subscribe(0, strategy_items.append, strategy_id=1)
+    event_bus.subscribe(0, symbol_items.append, strategy_id=1, symbol='BBB')
+    items = [create_item(strategy_id, symbol) for strategy_id in [1, 2] for symbol in ['AAA', 'BBB']]
+    for item in items:
+        event_bus.publish(0, item)
+
+    assert all_items == items
+    assert strategy_items == items[:2]
+    assert symbol_items == [items[1]]
+    assert event_bus.active[0] and not event_bus.active[1]
+
+    event_bus.unsubscribe(0, all_items.append)
+    event_bus.publish(0, items[0])
+    assert 4 == len(all_items) and 3 == len(strategy_items)
+
+
+def test_batched_handlers_receive_a_bar_once_on_flush():
+    event_bus = EventBus([0])
+    batches, strategy_batches = [], []
+    event_bus.subscribe(0, batches.append, batched=True)
+    event_bus.subscribe(0, strategy_batches.append, strategy_id=2, batched=True)
+    items = [create_item(1, 'AAA'), create_item(2, 'AAA'), create_item(1, 'BBB')]
+    for item in items:
+        event_bus.publish(0, item)
+
+    assert [] == batches
+    event_bus.flush()
+    event_bus.flush()
+    assert batches == [items]
+    assert strategy_batches == [[items[1]]]
+
+    event_bus.unsubscribe(0, batches.append)
+    event_bus.unsubscribe(0, strategy_batches.append)
+    assert not event_bus.active[0]
+
+
+def test_bound_event_keeps_the_keyword_api():
+    event_bus = EventBus([0])
+    event = BoundEvent(event_bus, 0, 'order')
+    orders = []
+
+    def on_order(order):
+        orders.append(order)
+
+    items = [create_item(1, 'AAA'), create_item(1, 'BBB')]
+    event.add_handler(on_order)
+    event(items[0])
+    event(order=items[1])
+    event.remove_handler(on_order)
+    event(items[0])
+
+    assert orders == items
+    assert not event_bus.active[0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource
+
+
+def get_smoothed(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    # seeded with the simple average of the first period, as the incremental indicators are
+    smoothed = np.full(len(values), np.nan)
+    seeded = np.r_[values[:period].mean(), values[period:]]
+    smoothed[period - 1:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return smoothed
+
+
+def get_expected_values(arrays):
+    close, high, low = arrays['close'], arrays['high'], arrays['low']
+    sma = pd.Series(close).rolling(10).mean().to_numpy()
+    ema = get_smoothed(close, 10, 2 / 11)
+
+    changes = np.diff(close)
+    average_gains = np.r_[np.nan, get_smoothed(np.maximum(changes, 0), 14, 1 / 14)]
+    average_losses = np.r_[np.nan, get_smoothed(np.maximum(-changes, 0), 14, 1 / 14)]
+    with np.errstate(divide='ignore'):
+        rsi = np.where(0 == average_losses, 100.0, 100 - 100 / (1 + average_gains / average_losses))
+
+    previous_close = np.r_[np.nan, close[:-1]]
+    true_ranges = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = get_smoothed(true_ranges, 14, 1 / 14)
+
+    middle = pd.Series(close).rolling(20).mean().to_numpy()
+    deviation = pd.Series(close).rolling(20).std(ddof=0).to_numpy()
+    bands = np.stack([middle, middle + 2 * deviation, middle - 2 * deviation], axis=1)
+    return [sma, ema, rsi, atr, bands]
+
+
+@pytest.mark.parametrize('preload', [True, False])
+def test_incremental_indicators_equal_full_recomputation(ohlcv_factory, conf_dict_factory, preload):
+    records = []
+    conf_dict = conf_dict_factory('indicator_strategy.py', {'records': records}, symbols=['AAA', 'BBB'],
+                                  time_frames=[60, 300])
+    backtest = Backtest(None, {'AAA': MemorySource(ohlcv_factory(1)), 'BBB': MemorySource(ohlcv_factory(2))},
+                        conf_dict)
+    backtest.run(preload=preload, progress=False)
+
+    expected_dict = {}
+    for symbol in ['AAA', 'BBB']:
+        for time_frame in [60, 300]:
+            arrays = backtest.market.data.get_ohlcv_arrays(symbol, time_frame, None)
+            indices_dict = {int(timestamp): index for index, timestamp in enumerate(arrays['timestamp'])}
+            expected_dict[symbol, time_frame] = indices_dict, get_expected_values(arrays)
+
+    # each closed candle is seen once, the last higher time frame candle closes after the data ends
+    keys = [(symbol, time_frame, timestamp) for symbol, time_frame, timestamp, _ in records]
+    assert len(keys) == len(set(keys))
+    for (symbol, time_frame), (indices_dict, _) in expected_dict.items():
+        timestamps = sorted(key[2] for key in keys if key[:2] == (symbol, time_frame))
+        assert timestamps == sorted(indices_dict)[:len(timestamps)] and len(indices_dict) - 1 <= len(timestamps)
+    for symbol, time_frame, timestamp, values in records:
+        indices_dict, expected_values = expected_dict[symbol, time_frame]
+        index = indices_dict[timestamp]
+        for value, expected in zip(values, expected_values):
+            if np.isnan(expected[index]).any():
+                assert value is None
+            else:
+                np.testing.assert_allclose(value, expected[index], rtol=1e-9)
@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.journal import FileJournal, SQLiteJournal
+from backtest.core.source import MemorySource
+from backtest.model.constant import EventType, OrderStatus
+
+
+@pytest.fixture
+def backtest(ohlcv_factory, conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003})
+    return Backtest(None, {'AAA': MemorySource(ohlcv_factory(1))}, conf_dict)
+
+
+def test_file_journal_keeps_records_as_they_were_published(backtest, tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    with FileJournal(path, batch_size=7) as journal:
+        journal.attach(backtest.market, [EventType.NEW_OPEN_ORDER, EventType.NEW_FILLED_ORDER,
+                                         EventType.NEW_CLOSED_POSITION])
+        positions = backtest.run(preload=True, progress=False)
+    records = FileJournal.read(path)
+
+    open_records = [record for record in records if EventType.NEW_OPEN_ORDER == record['event']]
+    filled_records = [record for record in records if EventType.NEW_FILLED_ORDER == record['event']]
+    position_records = [record for record in records if 'positions' == record['table']]
+    assert 0 < len(open_records) and 0 < len(filled_records)
+    assert all(OrderStatus.OPEN == record['status'] and record['filled_price'] is None for record in open_records)
+    assert all(OrderStatus.FILLED == record['status'] for record in filled_records)
+    assert [record['id'] for record in position_records] == [str(position.id) for position in positions]
+    assert len(records) == journal.written and 0 == journal.dropped
+
+
+def test_sqlite_journal_writes_every_record(backtest, tmp_path):
+    path = str(tmp_path / 'journal.db')
+    with SQLiteJournal(path) as journal:
+        journal.attach(backtest.market)
+        positions = backtest.run(preload=True, progress=False)
+
+    with sqlite3.connect(path) as connection:
+        assert len(positions) == connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        assert 0 < connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+
+def test_journal_fails_the_caller_when_its_sink_cannot_be_opened(tmp_path):
+    (tmp_path / 'file').write_text('')
+    with pytest.raises(OSError):
+        FileJournal(str(tmp_path / 'file' / 'journal.jsonl'))
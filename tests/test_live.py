@@ -0,0 +1,57 @@
+import asyncio
+
+from backtest.core.live import LiveMarket, MemoryCandleStream, SourceCandleStream
+from backtest.core.market import Market
+from backtest.core.source import MemorySource
+from backtest.model.candle import Candle
+
+
+def create_candle(timestamp: int, close: float = 100) -> Candle:
+    return Candle(timestamp, close, close + 1, close - 1, close, 1)
+
+
+def create_market(conf_dict_factory, records):
+    return Market(None, conf_dict_factory('recording_strategy.py', {'records': records}, symbols=['AAA', 'BBB']))
+
+
+def test_candles_of_other_symbols_are_ignored(conf_dict_factory):
+    records = []
+    market = create_market(conf_dict_factory, records)
+    timestamps = [1600002000 + 60 * index for index in range(3)]
+    candles = [(symbol, create_candle(timestamp)) for timestamp in timestamps for symbol in ['CCC', 'AAA', 'BBB']]
+    candles.append(('CCC', create_candle(timestamps[-1] + 60)))
+    live_market = LiveMarket(market, MemoryCandleStream(candles))
+    asyncio.run(live_market.run())
+
+    assert 3 == live_market.bars and 0 == live_market.late_candles and 0 == live_market.filled_candles
+    assert timestamps[-1] == market.data.get_last_candle('BBB').timestamp
+    assert records == [(timestamp, 1, symbol, 60) for timestamp in timestamps for symbol in ['AAA', 'BBB']]
+
+
+def test_missing_candles_are_filled_after_the_deadline_and_late_ones_dropped(conf_dict_factory):
+    records = []
+    market = create_market(conf_dict_factory, records)
+    timestamps = [1600002000 + 60 * index for index in range(3)]
+    candles = [('AAA', create_candle(timestamps[0])), ('BBB', create_candle(timestamps[0], 50)),
+               ('AAA', create_candle(timestamps[1])), ('AAA', create_candle(timestamps[2])),
+               ('BBB', create_candle(timestamps[2])), ('BBB', create_candle(timestamps[1]))]
+    live_market = LiveMarket(market, MemoryCandleStream(candles, delay=0.1), deadline=0.25)
+    asyncio.run(live_market.run())
+
+    assert 3 == live_market.bars and 1 == live_market.late_candles and 1 == live_market.filled_candles
+    assert records == [(timestamp, 1, symbol, 60) for timestamp in timestamps for symbol in ['AAA', 'BBB']]
+    assert timestamps[-1] == market.data.get_last_candle('BBB').timestamp
+
+
+def test_source_stream_drives_every_bar(ohlcv_factory, conf_dict_factory):
+    records = []
+    market = create_market(conf_dict_factory, records)
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=30), 'BBB': ohlcv_factory(2, length=30)}
+    stream = SourceCandleStream({symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, batch_size=7)
+    live_market = LiveMarket(market, stream)
+    asyncio.run(live_market.run())
+
+    timestamps = ohlcv_dict['AAA']['timestamp'].tolist()
+    assert 30 == live_market.bars and 0 == live_market.late_candles
+    assert records == [(timestamp, 1, symbol, 60) for timestamp in timestamps for symbol in ['AAA', 'BBB']]
+    assert ohlcv_dict['BBB']['close'][-1] == market.data.get_last_candle('BBB').close
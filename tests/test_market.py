@@ -0,0 +1,61 @@
+import itertools
+
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource
+from backtest.model.order import Order
+
+
+def test_dispatch_follows_each_strategys_product_order(ohlcv_factory, conf_dict_factory):
+    records = []
+    conf_dict = conf_dict_factory('recording_strategy.py', {'records': records}, symbols=['AAA', 'BBB'],
+                                  time_frames=[60, 300, 900])
+    strategy_dict = conf_dict['strategy']['files'][0]
+    strategy_dict['variants'] = [{'id': 5, 'time-frames': [300, 60]}, {'id': 6, 'symbols': ['BBB', 'AAA']}]
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=100), 'BBB': ohlcv_factory(2, length=100)}
+    Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict) \
+        .run(preload=True, progress=False)
+
+    expected = []
+    for timestamp in ohlcv_dict['AAA']['timestamp'].tolist():
+        for strategy_id, symbols, time_frames in [(5, ['AAA', 'BBB'], [300, 60]), (6, ['BBB', 'AAA'], [60, 300, 900])]:
+            expected.extend((timestamp, strategy_id, symbol, time_frame)
+                            for symbol, time_frame in itertools.product(symbols, time_frames)
+                            if 0 == timestamp % time_frame)
+    assert records == expected
+
+
+def get_position_tuple(position):
+    return (position.symbol, position.side, position.entry_timestamp, position.exit_timestamp, position.entry_price,
+            position.exit_price)
+
+
+def test_snapshot_resumes_the_same_backtest(ohlcv_factory, conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                  time_frames=[60, 300])
+    ohlcv_dict = {'AAA': ohlcv_factory(1), 'BBB': ohlcv_factory(2)}
+    expected = Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict) \
+        .run(progress=False)
+
+    head_sources_dict = {symbol: MemorySource({column: array[:777] for column, array in ohlcv.items()})
+                         for symbol, ohlcv in ohlcv_dict.items()}
+    head_backtest = Backtest(None, head_sources_dict, conf_dict)
+    head_positions = head_backtest.run(progress=False)
+
+    tail_backtest = Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict)
+    tail_backtest.market.restore(head_backtest.market.snapshot())
+    tail_positions = tail_backtest.run(progress=False)
+
+    assert 0 < len(head_positions) and 0 < len(tail_positions)
+    assert [get_position_tuple(position) for position in expected] == \
+           [get_position_tuple(position) for position in head_positions + tail_positions]
+
+
+def test_snapshot_does_not_use_up_order_ids(ohlcv_factory, conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003})
+    backtest = Backtest(None, {'AAA': MemorySource(ohlcv_factory(1, length=10))}, conf_dict)
+    backtest.run(progress=False)
+
+    order_id = Order.get_next_id()
+    backtest.market.snapshot()
+    backtest.market.snapshot()
+    assert order_id == Order.get_next_id() == Order(1, 100, None, None, False, '').id
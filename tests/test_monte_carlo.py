@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.monte_carlo import MonteCarlo
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.core.source import MemorySource
+from backtest.model.constant import FillResolution, ResamplingMethod
+
+
+@pytest.fixture
+def measures(ohlcv_factory, conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, **{'fill-resolution': FillResolution.PATH})
+    positions = Backtest(None, {'AAA': MemorySource(ohlcv_factory(1))}, conf_dict).run(preload=True, progress=False)
+    return PerformanceMeasures(positions, fix_equity=1000)
+
+
+@pytest.mark.parametrize('method', [ResamplingMethod.BOOTSTRAP, ResamplingMethod.PERMUTATION])
+def test_parallel_simulations_equal_serial_ones(measures, method):
+    results = MonteCarlo(measures, 1000, method, chunk_size=300, seed=7).run()
+    pd.testing.assert_frame_equal(results, MonteCarlo(measures, 1000, method, chunk_size=300, seed=7, workers=2).run())
+
+    assert 1000 == len(results) and ['net_profit', 'maximum_drawdown', 'sharpe_ratio'] == results.columns.tolist()
+    assert not results.equals(MonteCarlo(measures, 1000, method, chunk_size=300, seed=8).run())
+
+
+def test_permutations_keep_the_net_profit_and_reorder_the_drawdown(measures):
+    monte_carlo = MonteCarlo(measures, 500, ResamplingMethod.PERMUTATION, seed=1)
+    results = monte_carlo.run()
+
+    assert 10 < len(measures.profits)
+    np.testing.assert_allclose(results['net_profit'], measures.profits.sum())
+    assert (0 <= results['maximum_drawdown']).all() and 1 < results['maximum_drawdown'].nunique()
+    intervals = monte_carlo.get_confidence_intervals((0.05, 0.95))
+    assert (intervals.loc[0.05] <= intervals.loc[0.95]).all()
+
+
+def test_bootstrap_without_positions_and_unknown_method():
+    results = MonteCarlo(PerformanceMeasures([], fix_equity=1000), 10, seed=1).run()
+    assert (0 == results['net_profit']).all() and results['sharpe_ratio'].isna().all()
+    with pytest.raises(ValueError):
+        MonteCarlo(PerformanceMeasures([], fix_equity=1000), method='JACKKNIFE')
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from backtest.util.ohlcv_buffer import OHLCVBuffer
+
+
+@pytest.mark.parametrize('capacity', [None, 8])
+def test_arrays_handed_out_keep_their_data(capacity):
+    buffer = OHLCVBuffer(capacity, initial_size=4)
+    views = []
+    for index in range(50):
+        buffer.append(60 * index, index, index + 1, index - 1, index + 0.5, 1)
+        views.append((index, buffer.get_arrays(limit=3)))
+
+    for index, arrays in views:
+        timestamps = 60 * np.arange(max(index - 2, 0), index + 1)
+        assert arrays['timestamp'].tolist() == timestamps.tolist()
+        assert arrays['close'].tolist() == (timestamps / 60 + 0.5).tolist()
+    assert 50 == len(buffer)
+
+
+def test_bounded_buffer_keeps_the_latest_rows():
+    buffer = OHLCVBuffer(capacity=8)
+    for index in range(50):
+        buffer.append(60 * index, index, index, index, index, index)
+
+    assert buffer.get_arrays()['timestamp'].tolist()[-8:] == [60 * index for index in range(42, 50)]
+    assert buffer.get_row() == (60 * 49, 49.0, 49.0, 49.0, 49.0, 49.0)
+    assert buffer.get_dataframe(limit=2).index.tolist() == [48, 49]
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.optimizer import Optimizer
+from backtest.core.source import MemorySource
+from backtest.model.constant import FillResolution
+
+
+@pytest.fixture
+def conf_path(conf_dict_factory, tmp_path):
+    path = tmp_path / 'conf.json'
+    path.write_text(json.dumps(conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                                 **{'fill-resolution': FillResolution.PATH})))
+    return str(path)
+
+
+def test_grid_covers_every_combination():
+    assert Optimizer.grid({'fast': [2, 3], 'slow': [5, 8, 13]}) == \
+           [{'fast': fast, 'slow': slow} for fast in [2, 3] for slow in [5, 8, 13]]
+
+
+def test_latin_hypercube_puts_one_sample_in_every_stratum():
+    inputs_list = Optimizer.latin_hypercube({'width': (0.0, 1.0), 'period': (0, 99)}, 10, seed=1)
+
+    assert sorted(int(inputs['width'] * 10) for inputs in inputs_list) == list(range(10))
+    assert sorted(inputs['period'] // 10 for inputs in inputs_list) == list(range(10))
+    assert all(isinstance(inputs['period'], int) for inputs in inputs_list)
+    assert inputs_list == Optimizer.latin_hypercube({'width': (0.0, 1.0), 'period': (0, 99)}, 10, seed=1)
+
+
+def test_parallel_sweep_equals_standalone_backtests(ohlcv_factory, conf_dict_factory, conf_path):
+    ohlcv_dict = {'AAA': ohlcv_factory(1), 'BBB': ohlcv_factory(2)}
+    inputs_list = Optimizer.grid({'width': [0.002, 0.003, 0.005, 0.008, 0.013]})
+    optimizer = Optimizer(conf_path, 1, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()},
+                          workers=2, batch_size=2)
+    df = optimizer.run(inputs_list)
+
+    assert df['width'].tolist() == [inputs['width'] for inputs in inputs_list]
+    for inputs, row in zip(inputs_list, df.to_dict('records')):
+        conf_dict = conf_dict_factory('bracket_strategy.py', inputs, symbols=['AAA', 'BBB'],
+                                      **{'fill-resolution': FillResolution.PATH})
+        backtest = Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict)
+        backtest.run(preload=True, progress=False)
+        summary = backtest.get_performance_measures(1, fix_equity=1000).summary()
+        assert 0 < summary['total_closed_trades']
+        for name, value in summary.items():
+            np.testing.assert_equal(row[name], value)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from backtest.core.order_book import OrderBook
+from backtest.model.order import Order
+
+
+def create_orders(generator: np.random.Generator, count: int):
+    orders = []
+    for _ in range(count):
+        kind = generator.integers(4)
+        price = round(float(generator.uniform(95, 105)), 2) if kind in [1, 3] else None
+        stop_price = round(float(generator.uniform(95, 105)), 2) if kind in [2, 3] else None
+        orders.append(Order(int(generator.choice([-1, 1])), 100, price, stop_price, False, ''))
+    return orders
+
+
+def match_naively(orders_dict, low: float, high: float):
+    # the scan the order book replaced: every open order is visited in creation order
+    filled_orders = []
+    for order in sorted(orders_dict.values(), key=lambda order: order.id):
+        if order.stop_price and not order.is_activated and low <= order.stop_price <= high:
+            order.is_activated = True
+        if order.is_activated and (order.price is None or low <= order.price <= high):
+            del orders_dict[order.id]
+            filled_orders.append(order)
+    return filled_orders
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_match_equals_scan_of_all_orders(seed):
+    generator = np.random.default_rng(seed)
+    book, orders_dict = OrderBook(), {}
+    naive_orders_dict, copies_dict = {}, {}
+    filled_count = 0
+    for _ in range(200):
+        for order in create_orders(generator, int(generator.integers(0, 4))):
+            copy = Order(order.side, order.percentage, order.price, order.stop_price, order.reduce_only, '')
+            copy.id = order.id
+            book.add(order)
+            orders_dict[order.id] = order
+            naive_orders_dict[copy.id] = copies_dict[copy.id] = copy
+        if orders_dict and generator.random() < 0.1:
+            order_id = int(generator.choice(list(orders_dict)))
+            book.remove(order_id)
+            del orders_dict[order_id]
+            del naive_orders_dict[order_id]
+
+        middle = float(generator.uniform(96, 104))
+        low, high = round(middle - float(generator.uniform(0, 2)), 2), round(middle + float(generator.uniform(0, 2)), 2)
+        filled_ids = [order.id for order in book.match(low, high)]
+        for order_id in filled_ids:
+            del orders_dict[order_id]
+        filled_count += len(filled_ids)
+
+        assert filled_ids == [order.id for order in match_naively(naive_orders_dict, low, high)]
+        assert sorted(book.orders_dict) == sorted(naive_orders_dict)
+        assert all(order.is_activated == copies_dict[order.id].is_activated for order in orders_dict.values())
+    assert 0 < filled_count
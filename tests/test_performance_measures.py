@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.core.source import MemorySource
+from backtest.model.constant import FillResolution, PositionSide
+
+
+@pytest.fixture
+def positions(ohlcv_factory, conf_dict_factory):
+    # with PATH resolution the bracket exits cancel each other, so every closed position has an entry
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                  **{'fill-resolution': FillResolution.PATH})
+    sources_dict = {'AAA': MemorySource(ohlcv_factory(1)), 'BBB': MemorySource(ohlcv_factory(2))}
+    return Backtest(None, sources_dict, conf_dict).run(preload=True, progress=False)
+
+
+def get_maximum_run_up(positions, initial_capital):
+    equity, minimum_equity, maximum_run_up = initial_capital, initial_capital, 0
+    for position in positions:
+        maximum_run_up = max(maximum_run_up, round(equity - minimum_equity + position.run_up, 2))
+        equity += position.profit
+        minimum_equity = min(minimum_equity, equity)
+    return maximum_run_up
+
+
+def get_maximum_drawdown(positions, initial_capital):
+    equity, maximum_equity, maximum_equity_timestamp = initial_capital, 0, 0
+    maximum_drawdown, maximum_drawdown_duration = 0, 0
+    for position in positions:
+        maximum_drawdown = max(maximum_drawdown, round(maximum_equity - equity - position.drawdown, 2))
+        maximum_drawdown_duration = max(maximum_drawdown_duration, int(
+            (position.exit_timestamp - maximum_equity_timestamp) / position.time_frame))
+        equity = round(equity + position.profit, 2)
+        maximum_equity = max(maximum_equity, equity)
+        if equity == maximum_equity:
+            maximum_equity_timestamp = position.entry_timestamp
+    return maximum_drawdown, maximum_drawdown_duration
+
+
+@pytest.mark.parametrize('measures_kwargs', [{'fix_equity': 1000}, {'fix_quantity': 2}])
+def test_measures_equal_recomputation_over_positions(positions, measures_kwargs):
+    measures = PerformanceMeasures(positions, **measures_kwargs)
+    profits = np.array([position.profit for position in positions])
+    longs = np.array([position.profit for position in positions if PositionSide.LONG == position.side])
+    shorts = np.array([position.profit for position in positions if PositionSide.SHORT == position.side])
+
+    assert 0 < len(longs) and 0 < len(shorts)
+    assert measures.net_profit == tuple(measures.value2tuple(values.sum()) for values in [profits, longs, shorts])
+    assert measures.gross_profit == tuple(measures.value2tuple(values[0 < values].sum())
+                                          for values in [profits, longs, shorts])
+    assert measures.total_closed_trades == (len(profits), len(longs), len(shorts))
+    assert measures.bars.tolist() == [position.bars for position in positions]
+    assert measures.profits_percentage.tolist() == [position.profit_percentage for position in positions]
+
+    maximum_drawdown, maximum_drawdown_duration = get_maximum_drawdown(positions, measures.initial_capital)
+    assert measures.maximum_run_up == measures.value2tuple(get_maximum_run_up(positions, measures.initial_capital))
+    assert measures.maximum_drawdown == (*measures.value2tuple(maximum_drawdown), maximum_drawdown_duration)
+
+
+def test_measures_follow_positions_appended_in_place(positions):
+    appended_positions = positions[:len(positions) // 2]
+    measures = PerformanceMeasures(appended_positions, fix_equity=1000)
+    first_summary = measures.summary()
+    appended_positions.extend(positions[len(positions) // 2:])
+
+    assert first_summary == PerformanceMeasures(positions[:len(positions) // 2], fix_equity=1000).summary()
+    assert measures.summary() == PerformanceMeasures(list(positions), fix_equity=1000).summary()
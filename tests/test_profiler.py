@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.source import MemorySource
+from backtest.model.constant import FillResolution
+
+
+def create_backtest(ohlcv_dict, conf_dict_factory):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                  **{'fill-resolution': FillResolution.PATH})
+    return Backtest(None, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()}, conf_dict)
+
+
+def get_position_tuple(position):
+    return position.symbol, position.entry_timestamp, position.exit_timestamp, position.exit_price
+
+
+@pytest.mark.parametrize('preload', [True, False])
+def test_profiled_run_times_every_stage_of_every_bar(ohlcv_factory, conf_dict_factory, tmp_path, preload):
+    ohlcv_dict = {'AAA': ohlcv_factory(1, length=200), 'BBB': ohlcv_factory(2, length=200)}
+    expected = create_backtest(ohlcv_dict, conf_dict_factory).run(preload=True, progress=False)
+    backtest = create_backtest(ohlcv_dict, conf_dict_factory)
+    profiler = backtest.market.enable_profiler(per_bar=True)
+    positions = backtest.run(preload=preload, progress=False)
+    assert [get_position_tuple(position) for position in expected] == \
+           [get_position_tuple(position) for position in positions]
+
+    summary = profiler.summary().set_index('stage')
+    assert 200 == summary.loc['bar', 'calls'] == summary.loc['bar;trade.next', 'calls']
+    assert 200 == summary.loc['bar;strategy 1 AAA 60', 'calls'] == summary.loc['bar;trade.next;BBB 60', 'calls']
+    assert 200 == summary.loc['bar;data.next', 'calls']
+    # bars read from the preloaded arrays advance every pair at once
+    assert preload != ('bar;data.next;pair.next AAA' in summary.index)
+    assert profiler.total == summary.loc['bar', 'total']
+    assert (summary['self'] <= summary['total']).all()
+    children = [stage for stage in summary.index if 2 == len(stage.split(';'))]
+    np.testing.assert_allclose(summary.loc[children, 'total'].sum() + summary.loc['bar', 'self'], profiler.total)
+
+    bar_timings = profiler.get_bar_timings()
+    assert bar_timings.index.tolist() == ohlcv_dict['AAA']['timestamp'].tolist()
+    np.testing.assert_allclose(bar_timings['trade.next'].sum(), summary.loc['bar;trade.next', 'total'])
+
+    path = tmp_path / 'profile.folded'
+    profiler.dump_collapsed(str(path))
+    lines = path.read_text().splitlines()
+    assert [line.rsplit(' ', 1)[0] for line in lines] == summary.index.tolist()
+
+    backtest.market.disable_profiler()
+    assert backtest.market.profiler is None and backtest.market.data.profiler is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.signal_backtest import SignalBacktest
+from backtest.core.source import MemorySource
+from backtest.model.constant import PositionSide
+
+
+def get_position_tuple(position):
+    return (position.side, position.entry_timestamp, position.exit_timestamp, position.entry_price,
+            position.exit_price, position.profit_percentage, position.run_up_percentage, position.drawdown_percentage)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+@pytest.mark.parametrize('side', [PositionSide.LONG, PositionSide.SHORT])
+@pytest.mark.parametrize('stop_loss, take_profit', [(False, False), (True, False), (False, True), (True, True)])
+def test_signal_backtest_matches_event_driven_backtest(ohlcv_factory, conf_dict_factory, seed, side, stop_loss,
+                                                       take_profit):
+    ohlcv = ohlcv_factory(seed)
+    length = len(ohlcv['timestamp'])
+    generator = np.random.default_rng(seed)
+    close = ohlcv['close']
+    sma = pd.Series(close).rolling(10).mean().to_numpy()
+    entries = (sma < close) & (generator.random(length) < 0.3)
+    exits = generator.random(length) < 0.05
+    stop_losses = np.round(close * (1 - side * 0.004), 2) if stop_loss else np.full(length, np.nan)
+    take_profits = np.round(close * (1 + side * 0.006), 2) if take_profit else np.full(length, np.nan)
+
+    conf_dict = conf_dict_factory('signal_strategy.py', {
+        'timestamps': ohlcv['timestamp'], 'entries': entries, 'exits': exits, 'stop_loss': stop_losses,
+        'take_profit': take_profits, 'side': side})
+    backtest = Backtest(None, {'AAA': MemorySource(ohlcv)}, conf_dict)
+    expected = [get_position_tuple(position) for position in backtest.run(preload=True, progress=False)]
+
+    signal_backtest = SignalBacktest('AAA', 60, ohlcv, strategy_id=1, price_precision=2, quantity_precision=3)
+    positions = signal_backtest.run(entries, exits, side, stop_losses, take_profits)
+
+    assert 0 < len(expected)
+    assert expected == [get_position_tuple(position) for position in positions]
+
+
+def test_stop_loss_wins_a_bar_touching_both_exits(ohlcv_factory, conf_dict_factory):
+    ohlcv = ohlcv_factory(4)
+    length = len(ohlcv['timestamp'])
+    generator = np.random.default_rng(4)
+    close = ohlcv['close']
+    entries = generator.random(length) < 0.3
+    exits = np.zeros(length, dtype=bool)
+    # exits this close to the price are often both inside the next bar
+    stop_losses, take_profits = np.round(close * 0.9995, 2), np.round(close * 1.0005, 2)
+
+    conf_dict = conf_dict_factory('signal_strategy.py', {
+        'timestamps': ohlcv['timestamp'], 'entries': entries, 'exits': exits, 'stop_loss': stop_losses,
+        'take_profit': take_profits, 'side': PositionSide.LONG})
+    backtest = Backtest(None, {'AAA': MemorySource(ohlcv)}, conf_dict)
+    # the take profit also filled by ORDER resolution closes a position without entry
+    expected = [get_position_tuple(position) for position in backtest.run(preload=True, progress=False)
+                if position.entry_price is not None]
+
+    signal_backtest = SignalBacktest('AAA', 60, ohlcv, strategy_id=1, price_precision=2, quantity_precision=3)
+    positions = signal_backtest.run(entries, exits, PositionSide.LONG, stop_losses, take_profits)
+    tied_positions = [position for position in positions
+                      if position.exit_orders[0].stop_price is not None and
+                      take_profits[np.searchsorted(ohlcv['timestamp'], position.entry_timestamp)] <=
+                      ohlcv['high'][np.searchsorted(ohlcv['timestamp'], position.exit_timestamp)]]
+
+    assert 0 < len(tied_positions)
+    assert expected == [get_position_tuple(position) for position in positions]
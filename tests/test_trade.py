@@ -0,0 +1,51 @@
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.market import Market
+from backtest.core.source import MemorySource
+from backtest.model.candle import Candle
+from backtest.model.constant import EventType, FillResolution
+
+
+def run_bracket_strategy(ohlcv_factory, conf_dict_factory, fill_resolution):
+    conf_dict = conf_dict_factory('bracket_strategy.py', {'width': 0.003}, **{'fill-resolution': fill_resolution})
+    return Backtest(None, {'AAA': MemorySource(ohlcv_factory(1))}, conf_dict).run(preload=True, progress=False)
+
+
+def test_path_resolution_cancels_exits_beyond_the_open_position(ohlcv_factory, conf_dict_factory):
+    # both exits of the bracket fill on the same bar when it spans the two prices
+    positions = run_bracket_strategy(ohlcv_factory, conf_dict_factory, FillResolution.ORDER)
+    assert any(position.entry_price is None for position in positions)
+
+    positions = run_bracket_strategy(ohlcv_factory, conf_dict_factory, FillResolution.PATH)
+    assert 0 < len(positions)
+    assert all(position.entry_price is not None and 100 == position.exit_percentage for position in positions)
+
+
+@pytest.mark.parametrize('path, how, is_stop_first', [
+    (None, None, False),
+    ((100, 98.5, 101.5, 100), 'next', True),
+    ((100, 98.5, 101.5, 100), 'set_price_path', True),
+    ((100, 101.5, 98.5, 100), 'next', False),
+])
+def test_supplied_price_path_decides_which_exit_fills(conf_dict_factory, path, how, is_stop_first):
+    market = Market(None, conf_dict_factory('bracket_strategy.py', {'width': 0.01},
+                                            **{'fill-resolution': FillResolution.PATH}))
+    positions = []
+    market.event_bus.subscribe(EventType.NEW_CLOSED_POSITION, positions.append)
+    # a long entry fills at 100 on the second bar and the third bar spans both exits at 99 and 101
+    timestamp = 1600002000
+    market.next({'AAA': Candle(timestamp, 100, 100, 100, 100, 1)})
+    market.next({'AAA': Candle(timestamp + 60, 100, 100, 100, 100, 1)})
+    candles_dict = {'AAA': Candle(timestamp + 120, 100, 102, 98, 100, 1)}
+    if 'next' == how:
+        market.next(candles_dict, {'AAA': path})
+    else:
+        if 'set_price_path' == how:
+            market.data.set_price_path('AAA', path)
+        market.next(candles_dict)
+
+    assert 1 == len(positions) and 100 == positions[0].entry_price
+    assert [order.stop_price is not None for order in positions[0].exit_orders] == [is_stop_first]
+    # the path only applies to the bar it was given for
+    assert market.data.get_price_path('AAA') == (100, 102, 98, 100)
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pytest
+
+from backtest.core.backtest import Backtest
+from backtest.core.optimizer import Optimizer
+from backtest.core.performance_measures import PerformanceMeasures
+from backtest.core.source import MemorySource
+from backtest.core.walk_forward import WalkForward
+from backtest.model.constant import FillResolution
+
+
+@pytest.mark.parametrize('anchored, expected', [
+    (False, [(0, 40, 40, 50), (10, 50, 50, 60), (20, 60, 60, 65)]),
+    (True, [(0, 40, 40, 50), (0, 50, 50, 60), (0, 60, 60, 65)]),
+])
+def test_windows_step_by_the_out_of_sample_length(anchored, expected):
+    assert WalkForward.get_windows(0, 65, 40, 10, anchored) == expected
+    assert [] == WalkForward.get_windows(0, 40, 40, 10, anchored)
+
+
+def get_position_tuple(position):
+    return position.symbol, position.entry_timestamp, position.exit_timestamp, position.exit_price
+
+
+def run_window(ohlcv_dict, conf_dict_factory, inputs, start, end):
+    conf_dict = conf_dict_factory('bracket_strategy.py', inputs, symbols=['AAA', 'BBB'],
+                                  **{'fill-resolution': FillResolution.PATH})
+    sources_dict = {}
+    for symbol, ohlcv in ohlcv_dict.items():
+        mask = (start <= ohlcv['timestamp']) & (ohlcv['timestamp'] < end)
+        sources_dict[symbol] = MemorySource({column: array[mask] for column, array in ohlcv.items()})
+    backtest = Backtest(None, sources_dict, conf_dict)
+    backtest.run(preload=True, progress=False)
+    return backtest.get_positions(1)
+
+
+def test_out_of_sample_runs_the_best_in_sample_inputs(ohlcv_factory, conf_dict_factory, tmp_path):
+    ohlcv_dict = {'AAA': ohlcv_factory(1), 'BBB': ohlcv_factory(2)}
+    conf_path = tmp_path / 'conf.json'
+    conf_path.write_text(json.dumps(conf_dict_factory('bracket_strategy.py', {'width': 0.003}, symbols=['AAA', 'BBB'],
+                                                      **{'fill-resolution': FillResolution.PATH})))
+    inputs_list = Optimizer.grid({'width': [0.002, 0.003, 0.005, 0.008]})
+    walk_forward = WalkForward(str(conf_path), 1, {symbol: MemorySource(ohlcv) for symbol, ohlcv in ohlcv_dict.items()},
+                               workers=2, batch_size=2)
+    df = walk_forward.run(inputs_list, 400 * 60, 300 * 60, warmup=20 * 60)
+
+    assert 4 == len(df)
+    positions = []
+    for row in df.to_dict('records'):
+        scores = [PerformanceMeasures(run_window(ohlcv_dict, conf_dict_factory, inputs, row['in_sample_start'],
+                                                 row['in_sample_end']), fix_equity=1000).summary()['net_profit']
+                  for inputs in inputs_list]
+        assert row['width'] == inputs_list[int(np.argmax(scores))]['width']
+        assert row['in_sample_net_profit'] == max(scores)
+
+        window_positions = [position for position in run_window(
+            ohlcv_dict, conf_dict_factory, {'width': row['width']}, row['out_of_sample_start'] - 20 * 60,
+            row['out_of_sample_end']) if row['out_of_sample_start'] <= position.entry_timestamp]
+        summary = PerformanceMeasures(window_positions, fix_equity=1000).summary()
+        assert 0 < summary['total_closed_trades']
+        for name, value in summary.items():
+            np.testing.assert_equal(row['out_of_sample_' + name], value)
+        positions.extend(window_positions)
+
+    assert [get_position_tuple(position) for position in walk_forward.positions] == \
+           [get_position_tuple(position) for position in positions]